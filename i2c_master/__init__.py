@@ -7,8 +7,9 @@
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2026-02-08
+# modified: 2026-10-19
 
+import math
 import time
 from datetime import datetime as dt, timezone
 import smbus2
@@ -19,14 +20,17 @@ class I2CMaster:
     I2C_BUS_ID  = 1
     I2C_ADDRESS = 0x47
     WRITE_READ_DELAY_MS = 11
+    TICKS_PERIOD = 1 << 30 # the MicroPython ticks_ms() period
     '''
     I2C master controller.
 
-    NOTE: the WRITE_READ_DELAY_SEC may need adjusting for packet length and reliability.
+    NOTE: the WRITE_READ_DELAY_MS may need adjusting for packet length and reliability.
           If you're seeing the original command returned, that's because the master is
           reading the memory buffer before the slave has had a chance to modify it. The
           solution is to increase the delay time until this stops happening. Also, it
-          may help to increase the I2C baud rate.
+          may help to increase the I2C baud rate. Delays may also be set per
+          command verb, either directly or from the slave's own timing
+          statistics via calibrate_delays().
 
     Args:
         i2c_id:        the I2C bus identifier (default is 1)
@@ -39,6 +43,9 @@ class I2CMaster:
         self._timeset = timeset
         self._fail_on_exception = False
         self._delay_sec = self.WRITE_READ_DELAY_MS / 1000
+        self._command_delays = {} # per-verb delays in seconds
+        self._ticks_offset_ms = None # device ticks minus host monotonic time
+        self._transaction_sec = None # duration of the last write and read
         try:
             print('opening I2C bus {} at address {:#04x}'.format(self._i2c_bus_id, self._i2c_address))
             self._bus = smbus2.SMBus(self._i2c_bus_id)
@@ -49,28 +56,132 @@ class I2CMaster:
 
     # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
-    def get_write_read_delay_ms(self):
+    def get_write_read_delay_ms(self, command=None):
         '''
-        Return the current write/read delay in milliseconds.
+        Return the current write/read delay in milliseconds, for the command
+        verb if provided.
         '''
-        return self._delay_sec * 1000
+        return self._command_delays.get(command, self._delay_sec) * 1000
 
-    def set_write_read_delay_ms(self, delay_ms):
+    def set_write_read_delay_ms(self, delay_ms, command=None):
         '''
         Override the default write/read delay to the prescribed number of milliseconds.
+        If a command verb is provided the delay applies only to that command.
         '''
-        self._delay_sec = delay_ms / 1000
+        if command is None:
+            self._delay_sec = delay_ms / 1000
+        else:
+            self._command_delays[command.lower()] = delay_ms / 1000
 
     def reset_write_read_delay_ms(self):
         '''
-        Reset the default write/read delay to the default number of milliseconds.
+        Reset the default write/read delay to the default number of milliseconds,
+        clearing any per-command delays.
         '''
         self._delay_sec = self.WRITE_READ_DELAY_MS / 1000
+        self._command_delays.clear()
+
+    def get_transaction_ms(self):
+        '''
+        Return the time taken by the last successful request's write, delay
+        and read in milliseconds, excluding the pause that follows each
+        request, or None if no request has completed.
+        '''
+        return None if self._transaction_sec is None else self._transaction_sec * 1000
+
+    def calibrate_delays(self, commands, margin_ms=2, min_delay_ms=3):
+        '''
+        Set the write/read delay for each command verb from the slave's 'prof'
+        statistics: the worst-case processing time of the command, plus the
+        worst-case response write and scheduler tick (the latency before the
+        slave's main loop picks up a command), rounded up, plus a margin. The
+        commands should each have been sent a number of times beforehand.
+        Returns a dict of the delays set, in milliseconds.
+        '''
+        _overhead_us = self._get_profile_max_us('tx') + self._get_profile_max_us('tick')
+        delays = {}
+        for command in commands:
+            _max_us = self._get_profile_max_us(command)
+            if _max_us == 0:
+                print("WARNING: no profile for command '{}'.".format(command))
+                continue
+            delay_ms = max(min_delay_ms, math.ceil((_max_us + _overhead_us) / 1000) + margin_ms)
+            self.set_write_read_delay_ms(delay_ms, command)
+            delays[command] = delay_ms
+        return delays
+
+    def sync_clock(self, samples=5):
+        '''
+        Estimate the offset between the device's ticks_ms() and the host's
+        monotonic clock using the "clock" command. The device reads its clock
+        as it processes the command, i.e., soon after the write completes
+        (within a pass of its main loop, about a millisecond), so that is the
+        host time the reading is taken against; the delay before reading back
+        the response doesn't affect the estimate. Takes the sample with the
+        shortest write, returning its duration in milliseconds: the estimate
+        is late by at most that plus the device's processing latency.
+        '''
+        out_msg = pack_message('clock')
+        best_write_ms = None
+        for _ in range(samples):
+            try:
+                _written = []
+                start_ms = time.monotonic() * 1000
+                response = unpack_message(self._i2c_write_and_read(out_msg, self._delay_sec, _written))
+            except Exception as e:
+                print('WARNING: {} raised reading device clock: {}'.format(type(e), e))
+                continue
+            finally:
+                time.sleep(0.05)
+            if not response.isdigit():
+                continue
+            written_ms = _written[0] * 1000
+            write_ms = written_ms - start_ms
+            if best_write_ms is None or write_ms < best_write_ms:
+                best_write_ms = write_ms
+                self._ticks_offset_ms = int(response) - written_ms
+        if best_write_ms is None:
+            raise RuntimeError('unable to read device clock.')
+        return best_write_ms
+
+    def get_device_ticks(self, delay_ms=0):
+        '''
+        Return the device's ticks_ms() value delay_ms from now, as estimated
+        by sync_clock(), which must have been called first.
+        '''
+        if self._ticks_offset_ms is None:
+            raise RuntimeError('device clock not synchronised.')
+        return int(time.monotonic() * 1000 + delay_ms + self._ticks_offset_ms) % self.TICKS_PERIOD
+
+    def send_at(self, message, device_ticks):
+        '''
+        Queue the message on the device to run at the given device time, in
+        compact form, returning the response ("JOB <n>" if accepted). When
+        targeting several devices, obtain each device's ticks for the same
+        host time via get_device_ticks() and send to each ahead of it.
+        '''
+        return self.send_request('@{:x} {}'.format(device_ticks, message))
+
+    def _get_profile_max_us(self, key):
+        '''
+        Return the maximum time in microseconds recorded by the slave for the
+        key, zero if unavailable.
+        '''
+        response = self.send_request('prof {}'.format(key))
+        if response:
+            for field in response.split():
+                if field.startswith('max:'):
+                    return int(field[4:])
+        return 0
 
     def set_fail_on_exception(self, fail):
         self._fail_on_exception = fail
 
-    def _i2c_write_and_read(self, out_msg):
+    def _i2c_write_and_read(self, out_msg, delay_sec, written=None):
+        '''
+        Write the message, wait delay_sec, and read back the response. If
+        written is a list, the monotonic time the write completed is appended.
+        '''
         if out_msg is None:
             raise ValueError('null message.')
         elif len(out_msg) == 0:
@@ -80,7 +191,9 @@ class I2CMaster:
         msg_with_addr = [0x00] + list(out_msg)
         write_msg = smbus2.i2c_msg.write(self._i2c_address, msg_with_addr)
         self._bus.i2c_rdwr(write_msg)
-        time.sleep(self._delay_sec)
+        if written is not None:
+            written.append(time.monotonic())
+        time.sleep(delay_sec)
         # write register address 0, then read
         write_addr = smbus2.i2c_msg.write(self._i2c_address, [0x00])
         read_msg = smbus2.i2c_msg.read(self._i2c_address, 64)
@@ -104,8 +217,13 @@ class I2CMaster:
                 ts = now.strftime("%Y%m%d-%H%M%S")
                 message = message.replace("now", ts)
             out_msg = pack_message(message)
+            _parts = message.split(None, 1)
+            _verb = _parts[0].lower() if _parts else None
+            _delay_sec = self._command_delays.get(_verb, self._delay_sec)
             try:
-                resp_bytes = self._i2c_write_and_read(out_msg)
+                _start = time.monotonic()
+                resp_bytes = self._i2c_write_and_read(out_msg, _delay_sec)
+                self._transaction_sec = time.monotonic() - _start
                 response = unpack_message(resp_bytes)
                 return response
             except OSError as e:
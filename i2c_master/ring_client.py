@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+
+import time
+
+from .message_util import FRAME_SYMBOLS
+
+class RingClient:
+    MAX_PAYLOAD = 59    # the longest command the slave accepts
+    RAW_PER_CMD = 7     # raw pixels per command
+    MERGE_GAP   = 2     # unchanged pixels between changes sent rather than splitting a run
+    HEADROOM    = 1.5   # ratio of send interval to the time taken to send
+    EMA_ALPHA   = 0.2   # weight of each new latency measurement
+    '''
+    Keeps a ring on the slave in a desired state with as little bus traffic
+    as possible. A shadow copy of what the slave is displaying is compared
+    against each desired frame, and only the differences are sent, using
+    whichever of the frame upload commands takes the fewest round trips:
+    per-run uploads of the changed pixels, a fill, or a full frame.
+
+    Pixels whose colors are all in the palette (see set_palette()) are sent
+    as palette indices, otherwise as raw RGB. An all-black frame is a single
+    "ring clear", and a uniform frame of a palette color a single run-length
+    command; otherwise a uniform frame is sent as raw RGB like any other, as
+    "ring all" only accepts color names. The shadow starts unknown, so the
+    first update sends the full frame. The shadow assumes nothing else
+    changes the ring: call invalidate() after using rotate, theme or anim.
+
+    The send rate adapts to the measured bus latency: update() only sends
+    once the time taken by the previous send, times a headroom factor, has
+    elapsed. Frames given in the meantime are coalesced, as the next send
+    is computed against the latest desired frame; the last of these is held
+    as pending until sent by a later update(), or by poll(), which should be
+    called periodically when frames may stop arriving.
+
+    Args:
+        master:             the I2CMaster connected to the ring controller
+        count:              the number of ring pixels (default 24)
+        min_interval_sec:   the minimum time between sends (default 0)
+        atomic:             if True, wrap multi-command updates in "frame
+                            begin" and "frame show" so they appear at once
+    '''
+    def __init__(self, master, count=24, min_interval_sec=0.0, atomic=False):
+        self._master = master
+        self._count  = count
+        self._min_interval_sec = min_interval_sec
+        self._atomic = atomic
+        self._shadow  = [None] * count   # what the slave displays, None if unknown
+        self._desired = [(0, 0, 0)] * count
+        self._palette = {}               # RGB to palette index
+        self._latency_sec   = None       # moving average time per command
+        self._next_send     = 0.0
+        self._pending       = False      # True if a desired frame was held back
+        self._commands_sent = 0
+
+    @property
+    def latency_ms(self):
+        '''
+        The moving average time per command of the I2C transaction (write,
+        delay and read), in milliseconds, excluding the master's pause
+        between requests.
+        '''
+        return None if self._latency_sec is None else self._latency_sec * 1000
+
+    @property
+    def commands_sent(self):
+        return self._commands_sent
+
+    @property
+    def pending(self):
+        '''
+        True if a desired frame was held back by the send interval.
+        '''
+        return self._pending
+
+    def invalidate(self):
+        '''
+        Forget the slave's state, so that the next update sends the full frame.
+        '''
+        self._shadow = [None] * self._count
+
+    def set_palette(self, colors):
+        '''
+        Upload up to 64 RGB colors as the slave's user palette and select it.
+        Frames using only these colors are then sent as palette indices.
+        '''
+        if len(colors) > len(FRAME_SYMBOLS):
+            raise ValueError('palette is limited to {} colors.'.format(len(FRAME_SYMBOLS)))
+        self._palette = {}
+        for index, rgb in enumerate(colors):
+            self._send('frame color {} {}'.format(index, self._hex(rgb)))
+            self._palette.setdefault(tuple(rgb), index)
+        self._send('frame palette user')
+        # pixels sent using the previous palette are unaffected
+
+    def update(self, frame, force=False):
+        '''
+        Set the desired frame, a sequence of RGB tuples, and send the changes
+        if the send interval has elapsed (or if force is True). Returns the
+        number of commands sent, zero if none were needed or it was too soon,
+        in which case the frame is pending until a later update() or poll().
+        '''
+        if len(frame) != self._count:
+            raise ValueError('expected {} pixels, not {}.'.format(self._count, len(frame)))
+        self._desired = [tuple(rgb) for rgb in frame]
+        if not force and time.monotonic() < self._next_send:
+            self._pending = True
+            return 0
+        return self.flush()
+
+    def poll(self):
+        '''
+        Send a pending frame if the send interval has elapsed, returning the
+        number of commands sent.
+        '''
+        if not self._pending or time.monotonic() < self._next_send:
+            return 0
+        return self.flush()
+
+    def flush(self):
+        '''
+        Send any differences between the desired frame and the shadow now,
+        returning the number of commands sent.
+        '''
+        self._pending = False
+        commands = self._plan()
+        if not commands:
+            return 0
+        if self._atomic and len(commands) > 1:
+            commands = ['frame begin'] + commands + ['frame show']
+        start = time.monotonic()
+        sent = 0
+        timed = 0
+        transaction_ms = 0.0
+        for item in commands:
+            if isinstance(item, str):
+                acknowledged = self._send(item)
+            else:
+                command, first, last = item
+                acknowledged = self._send(command)
+                if acknowledged:
+                    self._shadow[first:last] = self._desired[first:last]
+                else:
+                    # unknown outcome: resend these pixels next time
+                    self._shadow[first:last] = [None] * (last - first)
+            if acknowledged:
+                transaction_ms += self._master.get_transaction_ms()
+                timed += 1
+            sent += 1
+        elapsed = time.monotonic() - start
+        if timed:
+            per_command = transaction_ms / timed / 1000
+            self._latency_sec = (per_command if self._latency_sec is None
+                    else self._latency_sec + RingClient.EMA_ALPHA * (per_command - self._latency_sec))
+        self._next_send = start + max(self._min_interval_sec, elapsed * RingClient.HEADROOM)
+        return sent
+
+    # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+    def _send(self, command):
+        '''
+        Send the command, returning True if acknowledged.
+        '''
+        self._commands_sent += 1
+        return self._master.send_request(command) == 'ACK'
+
+    def _plan(self):
+        '''
+        Return the cheapest list of (command, first, last) tuples that brings
+        the shadow to the desired frame, where first and last delimit the
+        pixels each command sets.
+        '''
+        desired = self._desired
+        runs = self._changed_runs()
+        if not runs:
+            return []
+        if all(rgb == desired[0] for rgb in desired) and desired[0] == (0, 0, 0):
+            return [('ring clear', 0, self._count)]
+        full = self._encode(0, self._count)
+        partial = []
+        for first, last in runs:
+            partial.extend(self._encode(first, last))
+        if len(full) < len(partial) or (len(full) == len(partial)
+                and sum(len(c[0]) for c in full) <= sum(len(c[0]) for c in partial)):
+            return full
+        return partial
+
+    def _changed_runs(self):
+        '''
+        Return (first, last) ranges of changed pixels, merging runs separated
+        by no more than MERGE_GAP unchanged pixels.
+        '''
+        runs = []
+        shadow, desired = self._shadow, self._desired
+        for i in range(self._count):
+            if shadow[i] != desired[i]:
+                if runs and i - runs[-1][1] <= RingClient.MERGE_GAP:
+                    runs[-1][1] = i + 1
+                else:
+                    runs.append([i, i + 1])
+        return [tuple(r) for r in runs]
+
+    def _encode(self, first, last):
+        '''
+        Return the commands setting pixels first to last (exclusive), using
+        the palette encodings if every color is in the palette, otherwise raw.
+        '''
+        pixels = self._desired[first:last]
+        if self._palette and all(rgb in self._palette for rgb in pixels):
+            indices = [self._palette[rgb] for rgb in pixels]
+            pal = self._encode_pal(first, indices)
+            rle = self._encode_rle(first, indices)
+            return rle if len(rle) < len(pal) or (len(rle) == len(pal)
+                    and sum(len(c[0]) for c in rle) < sum(len(c[0]) for c in pal)) else pal
+        commands = []
+        for start in range(first, last, RingClient.RAW_PER_CMD):
+            end = min(last, start + RingClient.RAW_PER_CMD)
+            data = ''.join(self._hex(rgb) for rgb in self._desired[start:end])
+            commands.append(('frame raw {} {}'.format(start, data), start, end))
+        return commands
+
+    def _encode_pal(self, first, indices):
+        commands = []
+        start = first
+        while start < first + len(indices):
+            prefix = 'frame pal {} '.format(start)
+            room = RingClient.MAX_PAYLOAD - len(prefix)
+            chunk = indices[start - first:start - first + room]
+            commands.append((prefix + ''.join(FRAME_SYMBOLS[i] for i in chunk), start, start + len(chunk)))
+            start += len(chunk)
+        return commands
+
+    def _encode_rle(self, first, indices):
+        runs = [] # [length, index]
+        for i in indices:
+            if runs and runs[-1][1] == i and runs[-1][0] < len(FRAME_SYMBOLS):
+                runs[-1][0] += 1
+            else:
+                runs.append([1, i])
+        commands = []
+        start = first
+        r = 0
+        while r < len(runs):
+            prefix = 'frame rle {} '.format(start)
+            room = (RingClient.MAX_PAYLOAD - len(prefix)) // 2
+            chunk = runs[r:r + room]
+            length = sum(n for n, _ in chunk)
+            data = ''.join(FRAME_SYMBOLS[n - 1] + FRAME_SYMBOLS[i] for n, i in chunk)
+            commands.append((prefix + data, start, start + length))
+            start += length
+            r += len(chunk)
+        return commands
+
+    @staticmethod
+    def _hex(rgb):
+        return '{:02x}{:02x}{:02x}'.format(*rgb)
+
+#EOF
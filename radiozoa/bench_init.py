@@ -0,0 +1,97 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Compares VL53L1X initialization time, one register per write (as formerly)
+# against a single burst write of the default configuration, for one sensor
+# and for the full Radiozoa array, using simulated register devices so that
+# no sensors need be connected. Reports the elapsed time on this board plus
+# the bus time the same traffic would take at the given I2C frequency.
+
+import time
+
+from vl53l1x import VL53L1X
+
+I2C_FREQ     = 400000
+ADDRESSES    = range(0x30, 0x38)
+_BOOT_STATUS = 0x00E5
+_GPIO_MUX    = 0x0030
+_GPIO_STATUS = 0x0031
+
+class SimulatedBus:
+    '''
+    A stand-in for machine.I2C with a register-map VL53L1X at each address,
+    already booted, whose data is always ready. Counts transactions and bytes.
+    '''
+    def __init__(self, addresses):
+        self._devices = {address: {_BOOT_STATUS: 1} for address in addresses}
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def bus_us(self, freq=I2C_FREQ):
+        '''
+        The time the counted traffic would take on the bus: nine clocks per
+        byte, plus the address byte and two register address bytes of each
+        transaction and a repeated start for reads (approximated as three more).
+        '''
+        return (self.bytes + 6 * self.transactions) * 9 * 1000000 // freq
+
+    def writeto_mem(self, address, register, buf, addrsize=8):
+        regs = self._devices[address]
+        for i in range(len(buf)):
+            regs[register + i] = buf[i]
+        self.transactions += 1
+        self.bytes += len(buf)
+
+    def readfrom_mem_into(self, address, register, buf, addrsize=8):
+        regs = self._devices[address]
+        for i in range(len(buf)):
+            if register + i == _GPIO_STATUS:
+                # data ready: the status bit matches the (active high) polarity
+                buf[i] = 0 if regs.get(_GPIO_MUX, 0) & 0x10 else 1
+            else:
+                buf[i] = regs.get(register + i, 0)
+        self.transactions += 1
+        self.bytes += len(buf)
+
+class LegacyVL53L1X(VL53L1X):
+    '''
+    Initializes as formerly: one register per write after a fixed boot delay.
+    '''
+    CONFIG_CHUNK_SIZE = 1
+
+    def init(self):
+        time.sleep_ms(102) # the former 100ms delay, then 2ms after the first boot poll
+        return super().init()
+
+def bench(label, cls, addresses):
+    bus = SimulatedBus(addresses)
+    start = time.ticks_us()
+    for address in addresses:
+        cls(bus, address=address)
+    elapsed_us = time.ticks_diff(time.ticks_us(), start)
+    print("{:<24} {:>2} sensor(s): {:>8}µs elapsed, {:>4} transactions, {:>6}µs on the bus".format(
+            label, len(addresses), elapsed_us, bus.transactions, bus.bus_us()))
+    return elapsed_us + bus.bus_us()
+
+try:
+    print("VL53L1X init, simulated devices at {}kHz:".format(I2C_FREQ // 1000))
+    for addresses in (ADDRESSES[:1], ADDRESSES):
+        before = bench('one write per register', LegacyVL53L1X, addresses)
+        after  = bench('burst write', VL53L1X, addresses)
+        print("  speedup: {:.1f}x".format(before / after))
+
+except Exception as e:
+    print('ERROR: {} raised by bench_init: {}'.format(type(e), e))
+
+#EOF
@@ -7,31 +7,49 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-01-27
-# modified: 2026-02-17
+# modified: 2026-10-19
 
 import sys
 import time
+import json
+from machine import I2C
 from colorama import Fore, Style
 
 from logger import Logger, Level
 from i2c_scanner import I2CScanner
-from radiozoa_config import RadiozoaConfig
+from radiozoa_config import RadiozoaConfig, probe
 from device import Device
 
 class Configure:
+    LAST_GOOD_PATH = '/radiozoa.json' # the addresses of the last good configuration
     '''
     Performs the action of scanning for VL53 devices and coordinating the
     RadiozoaConfig handling of their disabling/enabling, and setting their
     I2C addresses.
+
+    The fast path probes the expected addresses directly rather than scanning
+    the bus, and only sensors that are missing are reconfigured. The addresses
+    present after the last successful configuration are kept in flash. If any
+    sensor is still missing after reconfiguration, configuration fails and
+    nothing is saved, so that the sensor is retried on the next boot.
     '''
     def __init__(self, level=Level.INFO):
         self._log = Logger('config', level=level)
-        self._scanner = I2CScanner(i2c_id=1)
+        self._scanner = None # created on demand, for diagnostics only
+        self._i2c = I2C(1, freq=400_000) # shared with RadiozoaConfig
         self._default_i2c_address = 0x29
         self._devices = []
         self._radiozoa_config = None
+        self._configure_ms = None
         self._log.info('ready.')
 
+    @property
+    def configure_ms(self):
+        '''
+        The time taken by the last call to configure(), in milliseconds.
+        '''
+        return self._configure_ms
+
     @property
     def radiozoa_config(self):
         return self._radiozoa_config
@@ -40,64 +58,92 @@ class Configure:
         return self._devices
 
     def i2cdetect(self, color=Fore.CYAN):
+        if self._scanner is None:
+            self._scanner = I2CScanner(i2c_id=1)
         self._scanner.i2cdetect(color)
 
     def configure(self, force=False):
         '''
         Returns True if successful.
         '''
+        _start = time.ticks_ms()
         try:
             if force:
                 self._log.info(Fore.GREEN + "radiozoa sensor configuration… " + Style.BRIGHT + '(forced)')
             else:
                 self._log.info(Fore.GREEN + "radiozoa sensor configuration…")
-            for device in Device.all():
-                self._log.info("device '{}'; impl: {}; I2C address: 0x{:02X}; xshut: {}".format(device.label, device.impl, device.i2c_address, device.xshut))
-            # scan for existing sensors
-            self._devices = self._scanner.scan()
-            for device in self._devices:
-                self._log.info(Style.DIM + '  device: 0x{:02X}'.format(device))
-            _sensor_addresses = [ dev.i2c_address for dev in Device.all() ]
+            # probe for existing sensors
             self._log.info("checking for default address and missing sensors…")
-            _has_default = self._scanner.has_hex_address(self._default_i2c_address)
-            _missing = [ addr for addr in _sensor_addresses if not self._scanner.has_hex_address(addr) ]
-            if force or _has_default or _missing:
-                self.i2cdetect(Fore.WHITE)
+            _has_default = self._probe(self._default_i2c_address)
+            _expected = [ device for device in Device.all() if device.impl is not None ]
+            # an unconfigured sensor may be any of them, otherwise expect the last good configuration
+            _last_good = None if force or _has_default else self._load_last_good()
+            if _last_good is not None:
+                _skipped = [ device.label for device in _expected if device.i2c_address not in _last_good ]
+                if _skipped:
+                    self._log.warning("sensors absent from the last good configuration: {}".format(_skipped))
+                _expected = [ device for device in _expected if device.i2c_address in _last_good ]
+            _missing = [ device for device in _expected if force or not self._probe(device.i2c_address) ]
+            if _has_default or _missing:
                 if _has_default:
                     self._log.info(Fore.YELLOW + "found default 0x{:02X} device; reassigning radiozoa addresses…".format(self._default_i2c_address))
                 if _missing:
-                    self._log.info(Fore.YELLOW + "missing sensor addresses: {}".format([ "0x{:02X}".format(addr) for addr in _missing ]))
+                    self._log.info(Fore.YELLOW + "missing sensors: {}".format([ device.label for device in _missing ]))
                 try:
-                    self._radiozoa_config = RadiozoaConfig(i2c_id=1)
-                    self._radiozoa_config.configure()
-#                   self._radiozoa_config.close()
+                    self._radiozoa_config = RadiozoaConfig(i2c_id=1, i2c=self._i2c)
+                    self._radiozoa_config.configure(_missing)
                 except Exception as e:
                     self._log.error("{} raised during RadiozoaConfig configuration: {}".format(type(e), e))
                     raise
-                # re-scan after configuration
-                self._log.info("re-scanning for radiozoa sensor addresses…")
-                time.sleep_ms(1000)
-                self._devices = self._scanner.scan()
-                _has_default = self._scanner.has_hex_address(self._default_i2c_address)
-                _missing = [ addr for addr in _sensor_addresses if not self._scanner.has_hex_address(addr) ]
-                if _has_default:
+                # check the result
+                _missing = [ device for device in _expected if not self._probe(device.i2c_address) ]
+                if self._probe(self._default_i2c_address):
                     self._log.warning("default address 0x{:02X} is still present after configuration.".format(self._default_i2c_address))
                     self.i2cdetect(Fore.RED)
                     return False
                 if _missing:
-                    self._log.warning("missing sensor addresses after configuration: {}".format([ "0x{:02X}".format(addr) for addr in _missing ]))
+                    # not saved as the last good configuration, so retried on the next boot
+                    self._log.warning("missing sensors after configuration: {}".format([ device.label for device in _missing ]))
                     self.i2cdetect(Fore.RED)
+                    self._devices = [ device.i2c_address for device in _expected if device not in _missing ]
                     return False
                 else:
                     self._log.info(Fore.GREEN + "radiozoa sensor addresses configured successfully.")
-                    self.i2cdetect(Fore.GREEN)
             else:
                 self._log.info(Fore.GREEN + "radiozoa already configured.")
-                self.i2cdetect(Fore.CYAN)
+            self._devices = [ device.i2c_address for device in _expected if device not in _missing ]
+            if not self._devices:
+                return False
+            if _last_good is None or set(self._devices) != set(_last_good):
+                self._save_last_good(self._devices)
             self._log.info('complete.')
             return True
         except Exception as e:
             self._log.error('{} raised during configuration: {}'.format(type(e), e))
+        finally:
+            self._configure_ms = time.ticks_diff(time.ticks_ms(), _start)
+            self._log.info('configuration took {}ms.'.format(self._configure_ms))
         return False
 
+    def _probe(self, address):
+        return probe(self._i2c, address)
+
+    def _load_last_good(self):
+        '''
+        Returns the addresses of the last good configuration, or None if unknown.
+        '''
+        try:
+            with open(Configure.LAST_GOOD_PATH) as f:
+                return json.load(f)['addresses']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_last_good(self, addresses):
+        try:
+            with open(Configure.LAST_GOOD_PATH, 'w') as f:
+                json.dump({'addresses': addresses}, f)
+            self._log.info('saved configuration: {}'.format([ "0x{:02X}".format(addr) for addr in addresses ]))
+        except OSError as e:
+            self._log.error('{} raised saving configuration: {}'.format(type(e), e))
+
 #EOF
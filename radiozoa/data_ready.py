@@ -0,0 +1,120 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Tracks which sensors have data ready from their GPIO1 interrupt lines.
+
+import machine
+from machine import Pin
+
+class DataReady:
+    '''
+    Records which sensors have signalled data ready on their GPIO1 lines, each
+    wired to a pin whose IRQ handler sets the sensor's bit in a ready mask, so
+    that readiness needn't be polled over I2C. The handlers are hard IRQs and
+    don't allocate.
+
+    Each pin triggers on the edge of its sensor's interrupt polarity: rising
+    if active high (the VL53L1X default), falling if active low (as the
+    VL53L0X is configured).
+
+    Args:
+        pins:           a dict of sensor index to a tuple of its GPIO1 pin
+                        number and whether data ready is signalled high
+        pin_factory:    the class used to create the pins (default Pin); see
+                        VirtualPin for testing without hardware
+    '''
+    def __init__(self, pins, pin_factory=Pin):
+        self._ready = 0
+        self._pins  = {}
+        for index, (pin_id, active_high) in pins.items():
+            pin = pin_factory(pin_id, Pin.IN)
+            _trigger = Pin.IRQ_RISING if active_high else Pin.IRQ_FALLING
+            pin.irq(handler=self._handler(1 << index), trigger=_trigger, hard=True)
+            self._pins[index] = pin
+
+    @property
+    def indices(self):
+        '''
+        The indices of the sensors with a GPIO1 pin.
+        '''
+        return tuple(self._pins)
+
+    @property
+    def ready(self):
+        '''
+        The mask of sensors signalled ready and not yet taken.
+        '''
+        return self._ready
+
+    def _handler(self, mask):
+        def _irq(pin):
+            self._ready |= mask
+        return _irq
+
+    def take(self):
+        '''
+        Return the mask of sensors signalled ready, clearing it.
+        '''
+        state = machine.disable_irq()
+        ready = self._ready
+        self._ready = 0
+        machine.enable_irq(state)
+        return ready
+
+    def close(self):
+        '''
+        Remove the IRQ handlers.
+        '''
+        for pin in self._pins.values():
+            pin.irq(handler=None)
+        self._pins = {}
+
+class VirtualPin:
+    '''
+    A stand-in for a machine.Pin input with an IRQ, for testing without
+    hardware: set() drives its level, calling the handler on a matching edge.
+    '''
+    def __init__(self, pin_id, mode=None):
+        self._id      = pin_id
+        self._value   = 0
+        self._handler = None
+        self._trigger = 0
+
+    def irq(self, handler=None, trigger=Pin.IRQ_RISING, hard=False):
+        self._handler = handler
+        self._trigger = trigger
+        self._value   = 0 if trigger & Pin.IRQ_RISING else 1 # idle at the inactive level
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self.set(value)
+
+    def set(self, value):
+        '''
+        Drive the pin to value, calling the IRQ handler on a triggering edge.
+        '''
+        value = 1 if value else 0
+        previous, self._value = self._value, value
+        if self._handler is None or value == previous:
+            return
+        if (value and self._trigger & Pin.IRQ_RISING) or (not value and self._trigger & Pin.IRQ_FALLING):
+            self._handler(self)
+
+    def pulse(self):
+        '''
+        Signal data ready and release it, i.e., toggle from the idle level.
+        '''
+        idle = self._value
+        self.set(not idle)
+        self.set(idle)
+
+#EOF
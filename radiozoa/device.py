@@ -7,7 +7,7 @@
 #
 # author:   Murray Altheim
 # created:  2026-01-27
-# modified: 2026-02-17
+# modified: 2026-10-19
 #
 # Instances defined at bottom.
 
@@ -34,13 +34,17 @@ class Device:
 
           d = Device.by_index(3)
           print(d.label)
+
+    The gpio1 pin is that wired to the sensor's GPIO1 (data ready) line, or
+    None if not wired, in which case readiness is polled over I2C.
     '''
-    def __init__(self, index, impl, label, i2c_address, xshut):
+    def __init__(self, index, impl, label, i2c_address, xshut, gpio1=None):
         self._index = index
         self._impl  = impl
         self._label = label
         self._i2c_address = i2c_address
         self._xshut = xshut
+        self._gpio1 = gpio1
         Device._registry.append(self)
 
     @property
@@ -63,6 +67,10 @@ class Device:
     def xshut(self):
         return self._xshut
 
+    @property
+    def gpio1(self):
+        return self._gpio1
+
     def __int__(self):
         return self._index
 
@@ -107,14 +115,14 @@ class Device:
                 return d
         return None
 
-#            IDX  IMPL       DIR   ADDR   PIN    WIRE COLOR
-N0  = Device( 0, 'VL53L1X', 'N0',  0x30,  3) # red/grey
-NE1 = Device( 1, 'VL53L1X', 'NE1', 0x31, 35) # red/white
-E2  = Device( 2, 'VL53L1X', 'E2',  0x32,  2) # green/grey
-SE3 = Device( 3, 'VL53L1X', 'SE3', 0x33, 36) # green/white
-S4  = Device( 4, 'VL53L1X', 'S4',  0x34,  1) # blue/grey
-SW5 = Device( 5, 'VL53L1X', 'SW5', 0x35, 37) # blue/white
-W6  = Device( 6, 'VL53L1X', 'W6',  0x36,  0) # grey
-NW7 = Device( 7, 'VL53L1X', 'NW7', 0x37, 43) # white
+#            IDX  IMPL       DIR   ADDR   PIN  GPIO1    WIRE COLOR
+N0  = Device( 0, 'VL53L1X', 'N0',  0x30,  3, None) # red/grey
+NE1 = Device( 1, 'VL53L1X', 'NE1', 0x31, 35, None) # red/white
+E2  = Device( 2, 'VL53L1X', 'E2',  0x32,  2, None) # green/grey
+SE3 = Device( 3, 'VL53L1X', 'SE3', 0x33, 36, None) # green/white
+S4  = Device( 4, 'VL53L1X', 'S4',  0x34,  1, None) # blue/grey
+SW5 = Device( 5, 'VL53L1X', 'SW5', 0x35, 37, None) # blue/white
+W6  = Device( 6, 'VL53L1X', 'W6',  0x36,  0, None) # grey
+NW7 = Device( 7, 'VL53L1X', 'NW7', 0x37, 43, None) # white
 
 #EOF
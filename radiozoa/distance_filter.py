@@ -0,0 +1,162 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Smooths the distance readings of a set of sensors.
+
+import micropython
+from array import array
+
+# filter modes
+NONE   = 'none'   # the latest valid reading
+MEDIAN = 'median' # the median of the last window readings
+EMA    = 'ema'    # an exponential moving average
+KALMAN = 'kalman' # a one-dimensional Kalman filter
+FILTER_MODES = (NONE, MEDIAN, EMA, KALMAN)
+
+_FRAC_BITS = 4 # fractional bits of the EMA and Kalman estimates
+
+class DistanceFilter:
+    OUT_OF_RANGE = 9999
+    MAX_WINDOW   = 15
+    '''
+    Filters the distance readings of count sensors, each update returning the
+    filtered distance of one sensor. All state is held in preallocated arrays,
+    so updates don't allocate.
+
+    A reading with a non-zero range status (as from the VL53L1X/VL53L0X
+    range_status) is rejected as an outlier, leaving the filtered distance
+    unchanged; after reject_limit consecutive rejections the filter is reset
+    and the distance reported as OUT_OF_RANGE, as then the target has most
+    likely gone.
+
+    Args:
+        count:          the number of sensors
+        mode:           'none', 'median', 'ema' or 'kalman' (default 'median')
+        window:         the number of readings of the median (default 5)
+        alpha:          the EMA weight of each new reading, 1-256 (default 64)
+        noise_mm:       the Kalman measurement noise as a standard deviation
+                        in millimeters (default 20)
+        process_mm:     the Kalman process noise as a standard deviation in
+                        millimeters per reading, i.e., how fast the true
+                        distance is expected to change (default 10)
+        reject_limit:   consecutive rejections before reporting out of range
+                        (default 3)
+    '''
+    def __init__(self, count, mode=MEDIAN, window=5, alpha=64, noise_mm=20, process_mm=10, reject_limit=3):
+        if mode not in FILTER_MODES:
+            raise ValueError("unrecognised filter mode: '{}'".format(mode))
+        if not (1 <= window <= DistanceFilter.MAX_WINDOW):
+            raise ValueError('window must be between 1 and {}.'.format(DistanceFilter.MAX_WINDOW))
+        if not (1 <= alpha <= 256):
+            raise ValueError('alpha must be between 1 and 256.')
+        self._count   = count
+        self._mode    = mode
+        self._window  = window
+        self._alpha   = alpha
+        self._r       = noise_mm * noise_mm      # measurement variance (mm²)
+        self._q       = process_mm * process_mm  # process variance (mm²)
+        self._reject_limit = reject_limit
+        self._history = array('H', [0] * (count * window)) # a ring buffer per sensor
+        self._scratch = array('H', [0] * window)
+        self._heads   = bytearray(count)  # the next history slot of each sensor
+        self._fills   = bytearray(count)  # the number of readings in each history
+        self._rejects = bytearray(count)  # consecutive rejections
+        self._est     = array('l', [0] * count) # EMA or Kalman estimates, fixed point
+        self._var     = array('l', [0] * count) # Kalman estimate variances (mm²)
+        self._output  = array('H', [DistanceFilter.OUT_OF_RANGE] * count)
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def window(self):
+        return self._window
+
+    def reset(self, index=None):
+        '''
+        Forget the readings of the sensor, or of all sensors if index is None.
+        '''
+        for i in (range(self._count) if index is None else (index,)):
+            self._heads[i]   = 0
+            self._fills[i]   = 0
+            self._rejects[i] = 0
+            self._output[i]  = DistanceFilter.OUT_OF_RANGE
+
+    def value(self, index):
+        '''
+        Return the filtered distance of the sensor.
+        '''
+        return self._output[index]
+
+    def update(self, index, distance, status=0):
+        '''
+        Add a reading of the sensor with its range status (0 if valid),
+        returning the filtered distance.
+        '''
+        if status != 0 or distance >= DistanceFilter.OUT_OF_RANGE:
+            rejects = self._rejects[index] + 1
+            if rejects >= self._reject_limit:
+                self.reset(index)
+            else:
+                self._rejects[index] = rejects
+            return self._output[index]
+        self._rejects[index] = 0
+        fill = self._fills[index]
+        mode = self._mode
+        if mode == MEDIAN:
+            result = self._median(index, distance)
+        elif fill == 0 or mode == NONE:
+            # the first reading after a reset seeds the estimate
+            self._est[index] = distance << _FRAC_BITS
+            self._var[index] = self._r
+            self._fills[index] = 1
+            result = distance
+        elif mode == EMA:
+            est = self._est[index]
+            est += ((distance << _FRAC_BITS) - est) * self._alpha >> 8
+            self._est[index] = est
+            result = est >> _FRAC_BITS
+        else: # KALMAN
+            var = self._var[index] + self._q
+            gain = (var << 8) // (var + self._r) # 0-256
+            est = self._est[index]
+            est += ((distance << _FRAC_BITS) - est) * gain >> 8
+            self._est[index] = est
+            self._var[index] = var * (256 - gain) >> 8
+            result = est >> _FRAC_BITS
+        self._output[index] = result
+        return result
+
+    @micropython.native
+    def _median(self, index, distance):
+        window = self._window
+        base = index * window
+        head = self._heads[index]
+        history = self._history
+        history[base + head] = distance
+        self._heads[index] = (head + 1) % window
+        fill = self._fills[index]
+        if fill < window:
+            fill += 1
+            self._fills[index] = fill
+        # insertion sort of the filled part of the window into scratch
+        scratch = self._scratch
+        for i in range(fill):
+            value = history[base + i]
+            j = i
+            while j > 0 and scratch[j - 1] > value:
+                scratch[j] = scratch[j - 1]
+                j -= 1
+            scratch[j] = value
+        return scratch[fill >> 1]
+
+#EOF
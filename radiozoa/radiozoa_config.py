@@ -7,7 +7,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-01-27
-# modified: 2026-02-17
+# modified: 2026-10-19
 
 import sys
 import time
@@ -15,31 +15,60 @@ from machine import Pin, I2C
 from colorama import Fore, Style
 
 from logger import Logger, Level
-from i2c_scanner import I2CScanner
 from device import Device
 
+_VL53L1X_BOOT_STATE = 0x00E5 # the VL53L1X firmware system status register
+
+def probe(i2c, address):
+    '''
+    Returns True if a device on the I2C bus acknowledges the address.
+    '''
+    try:
+        i2c.writeto(address, b'')
+        return True
+    except OSError:
+        return False
+
 class RadiozoaConfig:
+    BOOT_TIMEOUT_MS = 50 # for a sensor to respond after its XSHUT is released
+    XSHUT_RESET_MS  = 2  # time for sensors to power down after XSHUT is set LOW
     '''
     Configures all VL53L0X sensors on the Radiozoa sensor board to their unique
     I2C addresses by toggling XSHUT pins and setting addresses as specified in
     the Device pseudo-enum.
+
+    Rather than waiting fixed delays, each sensor is polled with a short
+    timeout: first to respond (and for a VL53L1X, to report booted) at the
+    default address, then at its new address.
     '''
-    def __init__(self, i2c_id=1, level=Level.INFO):
+    def __init__(self, i2c_id=1, i2c=None, level=Level.INFO):
         self._log = Logger('config', level=level)
         self._i2c_id = i2c_id
         self._default_i2c_address = 0x29
-        self._i2c = None
+        self._i2c = i2c # if provided, shared with the caller
         self._i2c_baud_rate = 400_000 # default 100,000
         self._xshut_pins = {}
-        self._setup_i2c()
+        if self._i2c is None:
+            self._setup_i2c()
         self._setup_pins()
-        self._i2c_scanner = I2CScanner(i2c_id=self._i2c_id)
         self._log.info('ready.')
 
-    def configure(self):
-        self._shutdown_all_sensors()
-        self._configure_sensor_addresses()
-        self._log.info('all sensor addresses configured.')
+    def configure(self, devices=None):
+        '''
+        Assign addresses to the devices (default all), leaving any others, which
+        must already be at their own addresses, running. Returns the list of
+        devices successfully configured.
+        '''
+        if devices is None:
+            devices = Device.all()
+        devices = [ device for device in devices if device.impl is not None ]
+        self._shutdown_sensors(devices)
+        configured = self._configure_sensor_addresses(devices)
+        if len(configured) == len(devices):
+            self._log.info('all {} sensor addresses configured.'.format(len(devices)))
+        else:
+            self._log.warning('{} of {} sensor addresses configured.'.format(len(configured), len(devices)))
+        return configured
 
     def reset(self):
         from device import N0
@@ -72,63 +101,68 @@ class RadiozoaConfig:
         '''
         self._log.info('closing radiozoa config.')
 
-    def _shutdown_all_sensors(self):
+    def _shutdown_sensors(self, devices):
         '''
-        Shuts down all sensors by setting their XSHUT pins LOW.
+        Shuts down the sensors by setting their XSHUT pins LOW.
         '''
-        for device in Device.all():
-            if device.impl is not None:
-                self._log.info("shutting down sensor {} at XSHUT pin {}…".format(device.label, device.xshut))
-                self._set_xshut(device.index, False)
-                time.sleep_ms(50)
-        self._log.info('all sensors shut down.\n')
+        for device in devices:
+            self._log.info("shutting down sensor {} at XSHUT pin {}…".format(device.label, device.xshut))
+            self._set_xshut(device.index, False)
+        time.sleep_ms(self.XSHUT_RESET_MS)
+        self._log.info('{} sensors shut down.\n'.format(len(devices)))
 
-    def _configure_sensor_addresses(self):
+    def _configure_sensor_addresses(self, devices):
         '''
-        Sequentially brings up each sensor, sets its I2C address, leaving it enabled.
+        Sequentially brings up each sensor, sets its I2C address, leaving it
+        enabled. Returns the list of devices successfully configured.
         '''
-        from vl53l0x import VL53L0X
-        from vl53l1x import VL53L1X
+        configured = []
+        for device in devices:
+            self._log.info("configuring sensor {} at XSHUT pin {}…".format(device.label, device.xshut))
+            _start = time.ticks_ms()
+            self._set_xshut(device.index, True)
+            if not self._wait_for(self._default_i2c_address, device.impl):
+                self._log.warning("sensor {} did not appear at 0x{:02X}.".format(device.label, self._default_i2c_address))
+                continue
+            try:
+                self._set_i2c_address(device, device.i2c_address)
+                if self._wait_for(device.i2c_address):
+                    configured.append(device)
+                    self._log.info("set address for sensor {} to 0x{:02X} in {}ms.".format(
+                            device.label, device.i2c_address, time.ticks_diff(time.ticks_ms(), _start)))
+                else:
+                    self._log.warning("sensor {} did not appear at 0x{:02X}.".format(device.label, device.i2c_address))
+            except Exception as e:
+                self._log.error("{} raised setting address for sensor {}: {}".format(type(e), device.label, e))
+                sys.print_exception(e)
+        return configured
 
-        _device_delay_ms = 250
-        _scan_delay_ms   = 750
-        
-        for device in Device.all():
-            if device and device.impl is not None:
-                self._log.info("configuring sensor {} at XSHUT pin {}…".format(device.label, device.xshut))
-                self._set_xshut(device.index, True)
-                found = False
-                for i in range(5):
-                    time.sleep_ms(_scan_delay_ms)
-                    self._i2c_scanner.scan()
-                    found = self._i2c_scanner.has_hex_address(0x29)
-                    if found:
-                        self._log.info(Style.DIM + "[{}] sensor appeared at 0x29.".format(i))
-                        break
-                    else:
-                        self._log.info(Style.DIM + "[{}] waiting for sensor…".format(i))
-                if not found:
-                    self._log.warning("sensor {} did not appear at 0x29.".format(device.label))
-                    continue
+    def probe(self, address):
+        '''
+        Returns True if a device acknowledges the address.
+        '''
+        return probe(self._i2c, address)
+
+    def _wait_for(self, address, impl=None):
+        '''
+        Poll until a device acknowledges the address and, for a VL53L1X, reports
+        that it has booted, returning False after BOOT_TIMEOUT_MS.
+        '''
+        _buf = bytearray(1)
+        _deadline = time.ticks_add(time.ticks_ms(), self.BOOT_TIMEOUT_MS)
+        while True:
+            if self.probe(address):
+                if impl != 'VL53L1X':
+                    return True
                 try:
-                    # create temporary sensor instance at default address
-                    if device.impl == 'VL53L0X':
-                        temp_sensor = VL53L0X(self._i2c, address=0x29)
-                    elif device.impl == 'VL53L1X':
-                        temp_sensor = VL53L1X(self._i2c, address=0x29)
-                    else:
-                        self._log.warning("unknown sensor type {} for device {}".format(device.impl, device.label))
-                        continue
-                    
-                    # change address using sensor's method
-                    self._set_i2c_address(device, device.i2c_address)
-#                   temp_sensor.set_i2c_address(device.i2c_address)
-                    self._log.info("set address for sensor {} to 0x{:02X}".format(device.label, device.i2c_address))
-                    
-                except Exception as e:
-                    self._log.error("{} raised setting address for sensor {}: {}".format(type(e), device.label, e))
-                    sys.print_exception(e)
-                time.sleep_ms(_device_delay_ms)
+                    self._i2c.readfrom_mem_into(address, _VL53L1X_BOOT_STATE, _buf, addrsize=16)
+                    if _buf[0]:
+                        return True
+                except OSError:
+                    pass
+            if time.ticks_diff(_deadline, time.ticks_ms()) <= 0:
+                return False
+            time.sleep_ms(1)
 
     def _set_xshut(self, device_index, value):
         '''
@@ -157,11 +191,9 @@ class RadiozoaConfig:
         if device.impl == 'VL53L1X':
             # VL53L1X: write to register 0x0001
             self._i2c.writeto(current_addr, bytearray([0x00, 0x01, new_addr]))
-            time.sleep_ms(50)
         elif device.impl == 'VL53L0X':
             # VL53L0X: write to register 0x8A
             self._i2c.writeto_mem(current_addr, 0x8A, bytes([new_addr]))
-            time.sleep_ms(50)
         elif device.impl is None:
             self._log.info(Fore.WHITE + "no device at {}.".format(device.label))
         else:
@@ -7,7 +7,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-01-29
-# modified: 2026-02-17
+# modified: 2026-10-19
 
 import time
 from machine import I2C
@@ -36,6 +36,7 @@ class RadiozoaSensor:
         self._i2c = I2C(i2c_id)
         self._sensors = {}
         self._is_ranging = False
+        self._boot_to_ranging_ms = None
         self._create_sensors()
         self._distance_offset = 50
         self._log.info('ready.')
@@ -44,6 +45,14 @@ class RadiozoaSensor:
     def is_ranging(self): 
         return self._is_ranging
 
+    @property
+    def boot_to_ranging_ms(self):
+        '''
+        The time from boot until ranging was first started, in milliseconds,
+        or None if not yet started.
+        '''
+        return self._boot_to_ranging_ms
+
     def _create_sensors(self):
         '''
         Creates VL53L0X, VL53L1X or null instances for all eight sensors using Device pseudo-enum.
@@ -83,11 +92,51 @@ class RadiozoaSensor:
                     except Exception as e:
                         self._log.error('{} raised starting sensor {}: {}'.format(type(e), cardinal.name, e))
             self._is_ranging = True
-            time.sleep_ms(100)
-            self._log.info('ranging started.')
+            if self._boot_to_ranging_ms is None:
+                # ticks_ms() counts from boot
+                self._boot_to_ranging_ms = time.ticks_ms()
+                self._log.info('ranging started {}ms after boot.'.format(self._boot_to_ranging_ms))
+            else:
+                self._log.info('ranging started.')
         else:
             self._log.warning('already ranging.')
 
+    def set_timing(self, cardinal, budget_ms, distance_mode=None):
+        '''
+        Set the timing budget of a single sensor, and if provided its distance
+        mode (1=short, 2=long; VL53L1X only), stopping it. Returns False if
+        there is no sensor or the budget was not accepted.
+        '''
+        sensor = self._sensors.get(cardinal)
+        if not sensor:
+            return False
+        sensor.stop() # the budget can only be changed while stopped
+        if isinstance(sensor, VL53L1X):
+            if distance_mode is not None and sensor.set_distance_mode(distance_mode) != 0:
+                return False
+            # the budget is per distance mode, so is set after it
+            return sensor.set_timing_budget_in_ms(budget_ms) == 0
+        return sensor.set_measurement_timing_budget(budget_ms * 1000)
+
+    def start_sensor(self, cardinal, period_ms=0):
+        '''
+        Starts ranging for a single sensor, with a measurement every period_ms
+        if non-zero, otherwise back-to-back.
+        '''
+        sensor = self._sensors.get(cardinal)
+        if sensor:
+            try:
+                sensor.start(period_ms)
+                self._log.info('sensor {} ranging started.'.format(cardinal.name))
+            except Exception as e:
+                self._log.error('{} raised starting sensor {}: {}'.format(type(e), cardinal.name, e))
+                return
+            self._is_ranging = True
+            if self._boot_to_ranging_ms is None:
+                # ticks_ms() counts from boot
+                self._boot_to_ranging_ms = time.ticks_ms()
+                self._log.info('ranging started {}ms after boot.'.format(self._boot_to_ranging_ms))
+
     def stop_ranging(self):
         '''
         Stops ranging for all sensors.
@@ -128,6 +177,81 @@ class RadiozoaSensor:
             self._log.warning('no sensor for cardinal {}'.format(cardinal.name))
             return Sensor.OUT_OF_RANGE
 
+    def read_if_ready(self, cardinal, check=True):
+        '''
+        Get a new distance reading from a single sensor if one is ready, without
+        waiting. This subtracts the distance offset constant. Requires ranging to
+        have been started.
+
+        Args:
+            cardinal: Cardinal direction
+            check:    if False, assume data is ready (as signalled on GPIO1)
+                      rather than checking over I2C
+
+        Returns:
+            int: distance in millimeters, or None if no new reading is ready,
+            there is no sensor, or on error
+        '''
+        sensor = self._sensors.get(cardinal)
+        if sensor:
+            try:
+                dist = sensor.read_if_ready(check)
+                if dist is not None:
+                    return max(0, dist - self._distance_offset)
+            except Exception as e:
+                self._log.error('{} raised reading sensor {}: {}'.format(type(e), cardinal.name, e))
+        return None
+
+    def set_threshold(self, cardinal, low_mm, high_mm, window):
+        '''
+        Program the sensor's distance threshold window, so that it only
+        signals data ready when the window is met, or if window is None,
+        restore signalling every measurement. Distances are as returned by
+        read_if_ready(), i.e., less the distance offset. Only the VL53L1X
+        supports threshold windows.
+
+        Args:
+            cardinal: Cardinal direction
+            low_mm:   the low threshold in millimeters
+            high_mm:  the high threshold in millimeters
+            window:   0 below low_mm, 1 above high_mm, 2 outside, 3 inside,
+                      or None to disable
+
+        Returns:
+            bool: True if programmed
+        '''
+        sensor = self._sensors.get(cardinal)
+        if not isinstance(sensor, VL53L1X):
+            return False
+        try:
+            if window is None:
+                return sensor.clear_distance_threshold() == 0
+            return sensor.set_distance_threshold(low_mm + self._distance_offset,
+                    high_mm + self._distance_offset, window, 1) == 0
+        except Exception as e:
+            self._log.error('{} raised setting threshold of sensor {}: {}'.format(type(e), cardinal.name, e))
+            return False
+
+    def interrupt_active_high(self, cardinal):
+        '''
+        Returns True if the sensor signals data ready high on GPIO1, False if
+        low (as the VL53L0X is configured), or None if there is no sensor.
+        '''
+        sensor = self._sensors.get(cardinal)
+        if isinstance(sensor, VL53L1X):
+            return sensor.get_interrupt_polarity() == 1
+        elif isinstance(sensor, VL53L0X):
+            return False
+        return None
+
+    def range_status(self, cardinal):
+        '''
+        Returns the range status of the sensor's last reading by read_if_ready(),
+        0 if valid, or 255 if there is no sensor.
+        '''
+        sensor = self._sensors.get(cardinal)
+        return sensor.range_status if sensor else 255
+
     def get_distances(self, cardinals=None):
         '''
         Returns distance readings for specified cardinal directions, or all eight if no argument.
@@ -0,0 +1,208 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Staggers the measurements of the Radiozoa sensors and orders their reads.
+
+import time
+from array import array
+
+class RangingScheduler:
+    TIMING_BUDGETS_MS = (20, 33, 50, 100, 200, 500) # those valid in both distance modes
+    MARGIN_MS   = 5  # of the measurement period beyond the timing budget
+    RECHECK_MS  = 2  # before rechecking a sensor whose data wasn't ready
+    MAX_PRIORITY = 4
+    # named ranging profiles: (VL53L1X distance mode, timing budget in ms)
+    PROFILES = {
+        'fast':     (1, 20),  # short mode (to 1.3m), measuring at 40Hz
+        'balanced': (2, 100), # long mode (to 4m), at 9.5Hz
+        'accurate': (2, 200), # long mode, at 4.9Hz
+    }
+    DEFAULT_PROFILE = 'balanced'
+    SHORT_MODE = 1
+    # the order in which sensors are phased, alternating across the ring so
+    # that neighbouring sensors measure as far apart in time as possible
+    STAGGER_ORDER = (0, 4, 2, 6, 1, 5, 3, 7)
+    '''
+    Runs each sensor in timed continuous mode with its own measurement period
+    and timing budget, started at a phase offset so that data-ready events
+    are spread evenly over time rather than arriving together, which smooths
+    bus use and reduces crosstalk between neighbouring sensors.
+
+    Reads are serviced in deadline order: next_due() returns the sensor whose
+    measurement is expected soonest, once it's due. Each deadline tracks the
+    sensor's own clock, being set one period after a reading was found ready
+    (less RECHECK_MS, so that it's not overshot), or RECHECK_MS later if the
+    reading wasn't yet ready.
+
+    Sensors whose data ready is signalled by interrupt (see set_interrupts())
+    are read when signalled rather than at their deadlines, so their reads
+    only become due a period late, polling being just a fallback should an
+    interrupt be missed.
+
+    Sensors in event mode (see set_events()) only signal data ready when a
+    threshold window is met, so are checked just once per period.
+
+    Each sensor has a ranging profile (see PROFILES), 'balanced' unless set
+    otherwise, giving its distance mode and timing budget; its period is that
+    budget plus margin unless a period is given for all sensors.
+
+    Priorities multiply a sensor's measurement rate, e.g., {0: 2} measures the
+    forward-facing sensor twice per period; the timing budget of each sensor
+    is the longest that fits within its period, up to that of its profile.
+
+    Args:
+        radiozoa:   the RadiozoaSensor
+        cardinals:  the sensors' Cardinals, in index order
+        period_ms:  the measurement period of a sensor of priority 1, or None
+                    to follow its profile (default None)
+        priorities: an optional dict of sensor index to priority, 1-4
+        profiles:   an optional dict of sensor index to profile name
+    '''
+    def __init__(self, radiozoa, cardinals, period_ms=None, priorities=None, profiles=None):
+        _min_period_ms = RangingScheduler.TIMING_BUDGETS_MS[0] + RangingScheduler.MARGIN_MS
+        if period_ms is not None and period_ms < _min_period_ms:
+            raise ValueError('period must be at least {}ms.'.format(_min_period_ms))
+        self._radiozoa  = radiozoa
+        self._cardinals = cardinals
+        self._count     = len(cardinals)
+        self._period_ms = period_ms
+        self._profiles  = [RangingScheduler.DEFAULT_PROFILE] * self._count
+        self._modes     = bytearray(self._count)
+        self._periods   = array('H', [0] * self._count)
+        self._budgets   = array('H', [0] * self._count)
+        self._phases    = array('H', [0] * self._count)
+        self._deadlines = array('l', [0] * self._count) # ticks_ms
+        self._pending   = 0 # bitmask of sensors awaiting their staggered start
+        self._interrupts = 0 # bitmask of sensors signalling data ready by interrupt
+        self._events     = 0 # bitmask of sensors signalling only threshold events
+        _priorities = priorities or {}
+        _profiles = profiles or {}
+        for index in range(self._count):
+            priority = _priorities.get(index, 1)
+            if not (1 <= priority <= RangingScheduler.MAX_PRIORITY):
+                raise ValueError('priority must be between 1 and {}.'.format(RangingScheduler.MAX_PRIORITY))
+            name = _profiles.get(index, RangingScheduler.DEFAULT_PROFILE)
+            if name not in RangingScheduler.PROFILES:
+                raise ValueError("unrecognised ranging profile: '{}'".format(name))
+            mode, budget = RangingScheduler.PROFILES[name]
+            period = max(_min_period_ms, (period_ms or budget + RangingScheduler.MARGIN_MS) // priority)
+            self._profiles[index] = name
+            self._modes[index]   = mode
+            self._periods[index] = period
+            self._budgets[index] = min(budget, self._budget_for(period))
+        # sensors of the same period are phased evenly across it
+        for k, index in enumerate(RangingScheduler.STAGGER_ORDER):
+            if index < self._count:
+                self._phases[index] = k * self._periods[index] // self._count
+
+    @property
+    def period_ms(self):
+        return self._period_ms
+
+    @property
+    def interrupts(self):
+        return self._interrupts
+
+    def set_interrupts(self, mask):
+        '''
+        Set the bitmask of sensors whose data ready is signalled by interrupt.
+        '''
+        self._interrupts = mask
+
+    @property
+    def events(self):
+        return self._events
+
+    def set_events(self, mask):
+        '''
+        Set the bitmask of sensors in event mode.
+        '''
+        self._events = mask
+
+    def profile(self, index):
+        '''
+        Return the name of the sensor's ranging profile.
+        '''
+        return self._profiles[index]
+
+    def distance_mode(self, index):
+        '''
+        Return the sensor's distance mode, 1 (short) or 2 (long).
+        '''
+        return self._modes[index]
+
+    def timing(self, index):
+        '''
+        Return the (period, timing budget, phase) of the sensor in milliseconds.
+        '''
+        return self._periods[index], self._budgets[index], self._phases[index]
+
+    def _budget_for(self, period_ms):
+        budget = RangingScheduler.TIMING_BUDGETS_MS[0]
+        for candidate in RangingScheduler.TIMING_BUDGETS_MS:
+            if candidate + RangingScheduler.MARGIN_MS <= period_ms:
+                budget = candidate
+        return budget
+
+    def start(self):
+        '''
+        Set the distance mode and timing budget of each sensor and schedule its start at its
+        phase offset. Starts are made by next_due(), so this doesn't wait.
+        '''
+        _now = time.ticks_ms()
+        for index in range(self._count):
+            self._radiozoa.set_timing(self._cardinals[index], self._budgets[index], self._modes[index])
+            self._deadlines[index] = time.ticks_add(_now, self._phases[index])
+        self._pending = (1 << self._count) - 1
+
+    def next_due(self):
+        '''
+        Return the index of the sensor with the earliest deadline if due,
+        otherwise None. A sensor due to start is started instead, and None
+        returned, so that each call makes at most one use of the bus.
+        '''
+        _now = time.ticks_ms()
+        _deadlines = self._deadlines
+        _late = self._interrupts & ~self._pending
+        earliest = None
+        earliest_diff = 1
+        for index in range(self._count):
+            diff = time.ticks_diff(_deadlines[index], _now)
+            if (_late >> index) & 1:
+                diff += self._periods[index]
+            if diff < earliest_diff:
+                earliest = index
+                earliest_diff = diff
+        if earliest is None:
+            return None
+        mask = 1 << earliest
+        if self._pending & mask:
+            self._pending &= ~mask
+            self._radiozoa.start_sensor(self._cardinals[earliest], self._periods[earliest])
+            # the first measurement is ready after one period
+            _deadlines[earliest] = time.ticks_add(_now, self._periods[earliest] - RangingScheduler.RECHECK_MS)
+            return None
+        return earliest
+
+    def serviced(self, index, ready):
+        '''
+        Record whether the sensor's data was ready when checked. A sensor
+        in event mode is next checked after its next measurement either way.
+        '''
+        if ready:
+            delay = self._periods[index] - RangingScheduler.RECHECK_MS
+        elif (self._events >> index) & 1:
+            delay = self._periods[index]
+        else:
+            delay = RangingScheduler.RECHECK_MS
+        self._deadlines[index] = time.ticks_add(time.ticks_ms(), delay)
+
+#EOF
@@ -7,29 +7,84 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-01-27
-# modified: 2026-02-18
+# modified: 2026-10-19
 
 import micropython
-import asyncio
 import time
-from machine import Timer
+from array import array
+from machine import Pin
 from colorama import Fore, Style
 
 from logger import Logger, Level
 from device import Device
+from distance_filter import DistanceFilter, MEDIAN
+from ranging_scheduler import RangingScheduler
+from data_ready import DataReady
 from cardinal import Cardinal, NORTH
-from message_util import pack_message
+from message_util import pack_message, calculate_crc8
+import color_math
 from exceptions import IllegalStateError
 
+# VL53L1X threshold windows
+_WINDOW_BELOW = 0
+_WINDOW_ABOVE = 1
+
+_PACKED_ACK = pack_message('ACK')
+_PACKED_ERR = pack_message('ERR')
+
 class Sensor:
     OUT_OF_RANGE = 9999
     SENSOR_COUNT = 8
-    
+    CHECK_INTERVAL_MS = 2 # between runs of the poll job
+    COLOR_BUCKETS = 64    # distinct ring colors across each sensor's range
+    EVENT_ZONE_MM = 200   # the default event zone, as RadiozoaSensor.NEAR_THRESHOLD
+    EVENT_HYSTERESIS_MM = 20 # beyond the zone before an obstacle has left it
+    '''
+    Polls the Radiozoa sensors, publishing their distances as a packed message
+    and displaying them on the ring.
+
+    Polling never waits on a sensor: each run of the poll job checks at most
+    a single sensor for a new measurement, reading it only if ready, so that
+    the main loop (and with it the I2C slave) is serviced between sensors.
+    A RangingScheduler staggers the sensors' measurements and chooses which
+    is due next (see set_ranging()), so each sensor is read at its own
+    ranging rate, while the distances are published at no more than the
+    poll rate.
+
+    Optionally (see set_interrupts()), sensors whose GPIO1 data ready line
+    is wired to a pin signal their readiness by interrupt, and only those
+    signalled are read, without checking readiness over I2C.
+
+    In event mode (see set_events()) a sensor is programmed with a threshold
+    window so that it only signals data ready when an obstacle enters its
+    zone, then with the complementary window until it leaves, so that there
+    is nothing to read while the zone remains clear. Its distance is only
+    published on entering (and as out of range on leaving) and the events
+    are available to the master as a packed message (see take_events_packed()).
+
+    Ranging profiles (see set_profile()) trade rate against accuracy and
+    range, e.g., 'fast' while moving and 'accurate' while docking, for all
+    sensors or per sensor, switching at runtime; the ranging schedule and
+    the ring's color range follow each sensor's profile.
+
+    Readings pass through a DistanceFilter (by default a median of five, see
+    set_filter()), which also rejects readings with a bad range status, so
+    that single-reading spikes reach neither the ring nor the published
+    distances.
+
+    Publishing is driven by changes and doesn't allocate: the digits of each
+    changed distance are written into the packed message in place and its
+    CRC recalculated, and a ring pixel is only set when its distance moves
+    into another color bucket, the colors coming from a lookup table per
+    sensor type.
+    '''
+
     def __init__(self, controller=None, level=Level.INFO):
         if controller is None:
             raise ValueError('no controller provided.')
         self._log = Logger('sensor', level=level)
         self._controller = controller
+        self._scheduler = self._controller.scheduler
         self._radiozoa = self._controller.radiozoa
         self._ring = self._controller.ring
         self._min_distance_mm = 50 
@@ -38,12 +93,40 @@ class Sensor:
         self._enabled = False
         self._poll_delay_ms = 50 # 50 = 20Hz
         self._return_max_range = True # return maximum range rather than out of range
-        self._distances = (Sensor.OUT_OF_RANGE,) * Sensor.SENSOR_COUNT
-#       self._distances_fmt = " ".join(str(Sensor.OUT_OF_RANGE) for _ in range(Sensor.SENSOR_COUNT)) # generator expression
-        self._distances_fmt = " ".join([str(Sensor.OUT_OF_RANGE)] * Sensor.SENSOR_COUNT) # list multiplication
-        self._distances_packed = pack_message(self._distances_fmt)
+        self._readings  = array('H', [Sensor.OUT_OF_RANGE] * Sensor.SENSOR_COUNT) # latest filtered reading of each sensor
+        self._published = array('H', self._readings) # each reading as last published
+        self._changed   = (1 << Sensor.SENSOR_COUNT) - 1 # bitmask of sensors whose readings differ from those published
+        self._filter    = DistanceFilter(Sensor.SENSOR_COUNT)
+        self._published_ms = time.ticks_ms()
+        # the packed distances message, updated in place: [length][eight 4-digit distances][crc8]
+        self._distances_packed = bytearray(pack_message(" ".join([str(Sensor.OUT_OF_RANGE)] * Sensor.SENSOR_COUNT)))
+        self._crc_view = memoryview(self._distances_packed)[:-1]
         self._device_by_index  = {d.index: d for d in Device._registry}
-        self._task = None
+        self._cardinals = [Cardinal.from_id(index) for index in range(Sensor.SENSOR_COUNT)]
+        # ranging: period (None to follow profiles), priorities, profile and per sensor profiles
+        self._period_ms  = None
+        self._priorities = None
+        self._profile    = RangingScheduler.DEFAULT_PROFILE
+        self._profile_overrides = {}
+        self._ranging = RangingScheduler(self._radiozoa, self._cardinals) if self._radiozoa else None
+        # per sensor: ring pixel, maximum distance, color lookup table and displayed color bucket
+        self._pixels  = bytearray([cardinal.pixel - 1 for cardinal in self._cardinals])
+        self._max_mm  = array('H', [0] * Sensor.SENSOR_COUNT)
+        self._luts    = [None] * Sensor.SENSOR_COUNT
+        self._buckets = bytearray(Sensor.SENSOR_COUNT)
+        self._update_ranges()
+        self._data_ready = None # if interrupt driven
+        # event mode: per sensor zone, and bitmasks of sensors in event mode,
+        # inside their zones, and having entered or left since last taken
+        self._zones      = array('H', [0] * Sensor.SENSOR_COUNT)
+        self._event_mask = 0
+        self._inside     = 0
+        self._entered    = 0
+        self._left       = 0
+        self._events_packed = bytearray(pack_message('.' * Sensor.SENSOR_COUNT))
+        self._events_crc_view = memoryview(self._events_packed)[:-1]
+        self._signalled  = 0    # bitmask of sensors signalled ready but not yet read
+        self._job = self._scheduler.add('sensor', self._poll, period_ms=Sensor.CHECK_INTERVAL_MS, start=False)
 
     @property
     def enabled(self):
@@ -53,13 +136,13 @@ class Sensor:
     def distances(self):
         if not self._enabled:
             raise IllegalStateError('sensor not enabled')
-        return self._distances
+        return tuple(self._published)
 
     @property
     def distances_fmt(self):
         if not self._enabled:
             raise IllegalStateError('sensor not enabled')
-        return self._distances_fmt
+        return str(self._distances_packed[1:-1], 'ascii')
 
     @property
     def distances_packed(self):
@@ -70,58 +153,398 @@ class Sensor:
     def enable(self):
         if not self._enabled:
             self._enabled = True
-            self._task = asyncio.create_task(self._poll_loop())
+            if self._ranging:
+                # polling relies upon continuous ranging
+                self._ranging.start()
+            self._log.info('starting poll job…')
+            self._scheduler.schedule(self._job, 0)
 
     @property
     def poll_rate_hz(self):
-        return self._poll_delay_ms * 1000
+        return 1000 / self._poll_delay_ms
 
     def set_poll_rate_hz(self, rate_hz=20):
         '''
-        Set the sensor polling rate in Hz. The valid range is 0.5Hz to 50Hz, the
-        default is 20Hz. Calling this with no argument will reset to the default.
+        Set the sensor polling rate in Hz, i.e., the maximum rate at which the
+        distances are published and displayed; the sensors themselves are read
+        at their own ranging rate. The valid range is 0.5Hz to 50Hz, the default
+        is 20Hz. Calling this with no argument will reset to the default.
         '''
         if not (0.5 <= rate_hz <= 50):
             raise ValueError("rate_hz must be between 0.5 and 50 Hz")
         self._poll_delay_ms = int(1000 / rate_hz)
         self._log.info('sensor poll rate set to {}Hz (delay: {}ms).'.format(rate_hz, self._poll_delay_ms))
 
+    @property
+    def filter(self):
+        return self._filter
+
+    def set_filter(self, mode=MEDIAN, **kwargs):
+        '''
+        Replace the distance filter, with the mode ('none', 'median', 'ema' or
+        'kalman') and any other DistanceFilter arguments. Calling this with no
+        arguments resets to the default median of five.
+        '''
+        self._filter = DistanceFilter(Sensor.SENSOR_COUNT, mode=mode, **kwargs)
+        self._log.info("sensor filter set to '{}'.".format(mode))
+
+    @property
+    def ranging(self):
+        return self._ranging
+
+    def set_ranging(self, period_ms=None, priorities=None):
+        '''
+        Replace the ranging schedule, with the measurement period of a sensor
+        of priority 1 (None to follow each sensor's profile) and an optional
+        dict of sensor index to priority (1-4), each a multiple of the
+        measurement rate, e.g., {0: 2} for the forward sensor at twice the
+        rate of the others. If enabled, ranging restarts.
+        '''
+        if not self._radiozoa:
+            raise IllegalStateError('no radiozoa')
+        self._period_ms  = period_ms
+        self._priorities = priorities
+        self._restart_ranging()
+        self._log.info('sensor ranging period set to {}.'.format(
+                '{}ms'.format(period_ms) if period_ms else 'follow profiles'))
+
+    @property
+    def profile(self):
+        return self._profile
+
+    def set_profile(self, name=RangingScheduler.DEFAULT_PROFILE, index=None):
+        '''
+        Set the ranging profile ('fast', 'balanced' or 'accurate') of all
+        sensors, or if index is provided, override that of a single sensor;
+        a name of None removes the override. Overrides persist across changes
+        to the profile of all sensors. If enabled, ranging restarts.
+        '''
+        if not self._radiozoa:
+            raise IllegalStateError('no radiozoa')
+        if name is not None and name not in RangingScheduler.PROFILES:
+            raise ValueError("unrecognised ranging profile: '{}'".format(name))
+        if index is None:
+            if name is None:
+                raise ValueError('no profile provided.')
+            self._profile = name
+        elif not (0 <= index < Sensor.SENSOR_COUNT):
+            raise ValueError('index must be between 0 and {}.'.format(Sensor.SENSOR_COUNT - 1))
+        elif name is None:
+            self._profile_overrides.pop(index, None)
+        else:
+            self._profile_overrides[index] = name
+        self._restart_ranging()
+        self._update_ranges()
+        self._filter.reset()
+        self._log.info("sensor profile set to '{}'{}.".format(name, '' if index is None else ' for sensor {}'.format(index)))
+
+    def profile_command(self, arg2=None, arg3=None):
+        '''
+        Process the arguments of the 'sensor profile' command, returning a
+        packed response:
+
+            sensor profile                      # each sensor's profile initial, e.g., 'bbbbfbbb'
+                 | <name>                       # set all sensors: fast, balanced or accurate
+                 | <name> <index>               # override a single sensor
+                 | clear <index>                # remove the override of a single sensor
+        '''
+        try:
+            if arg2 is None:
+                return pack_message(''.join(self._ranging.profile(index)[0] for index in range(Sensor.SENSOR_COUNT)))
+            index = None if arg3 is None else int(arg3)
+            if arg2 == 'clear':
+                if index is None:
+                    return _PACKED_ERR
+                self.set_profile(None, index)
+            else:
+                self.set_profile(arg2, index)
+            return _PACKED_ACK
+        except Exception as e:
+            self._log.error("{} raised by profile command: {}".format(type(e), e))
+            return _PACKED_ERR
+
+    def _restart_ranging(self):
+        '''
+        Replace the ranging schedule from the period, priorities and profiles,
+        restarting ranging if enabled.
+        '''
+        _profiles = {index: self._profile_overrides.get(index, self._profile) for index in range(Sensor.SENSOR_COUNT)}
+        self._ranging = RangingScheduler(self._radiozoa, self._cardinals, period_ms=self._period_ms,
+                priorities=self._priorities, profiles=_profiles)
+        if self._data_ready:
+            self._ranging.set_interrupts(self._interrupt_mask())
+        self._ranging.set_events(self._event_mask)
+        if self._enabled:
+            self._ranging.start()
+
+    @property
+    def interrupts(self):
+        return self._data_ready is not None
+
+    def set_interrupts(self, enabled=True, pin_factory=Pin):
+        '''
+        Enable or disable interrupt-driven reads, for those sensors whose GPIO1
+        pin is set in the Device table, the remainder being polled as usual.
+        The pin_factory creates the pins, e.g., VirtualPin for testing.
+        '''
+        if not self._radiozoa:
+            raise IllegalStateError('no radiozoa')
+        if self._data_ready:
+            self._data_ready.close()
+            self._data_ready = None
+            self._signalled = 0
+        if enabled:
+            pins = {}
+            for index, cardinal in enumerate(self._cardinals):
+                gpio1 = self._device_by_index[index].gpio1
+                active_high = self._radiozoa.interrupt_active_high(cardinal)
+                if gpio1 is not None and active_high is not None:
+                    pins[index] = (gpio1, active_high)
+            if not pins:
+                raise IllegalStateError('no sensor has a GPIO1 pin.')
+            self._data_ready = DataReady(pins, pin_factory=pin_factory)
+        self._ranging.set_interrupts(self._interrupt_mask())
+        self._log.info('sensor interrupts {}.'.format('enabled' if enabled else 'disabled'))
+
+    def _interrupt_mask(self):
+        mask = 0
+        if self._data_ready:
+            for index in self._data_ready.indices:
+                mask |= 1 << index
+        return mask
+
+    @property
+    def events(self):
+        '''
+        The bitmasks of sensors (entered, left, inside) their zones, having
+        entered or left since the events were last taken.
+        '''
+        return self._entered, self._left, self._inside
+
+    def set_events(self, enabled=True, zone_mm=EVENT_ZONE_MM, zones=None):
+        '''
+        Enable or disable event mode, with a zone distance in millimeters for
+        all sensors, or per sensor by a dict of sensor index to zone distance
+        (0 to leave a sensor reporting every reading). Only the VL53L1X
+        supports threshold windows; other sensors report every reading. Zones
+        start clear, so an obstacle already inside one is reported as entered.
+        '''
+        if not self._radiozoa:
+            raise IllegalStateError('no radiozoa')
+        _zones = zones or {}
+        _mask = 0
+        for index, cardinal in enumerate(self._cardinals):
+            zone = _zones.get(index, zone_mm) if enabled else 0
+            if zone and self._radiozoa.set_threshold(cardinal, zone, 0, _WINDOW_BELOW):
+                _mask |= 1 << index
+            else:
+                if (self._event_mask >> index) & 1:
+                    self._radiozoa.set_threshold(cardinal, 0, 0, None)
+                zone = 0
+            self._zones[index] = zone
+            if zone:
+                # nothing within the zone
+                self._readings[index] = Sensor.OUT_OF_RANGE
+                self._changed |= 1 << index
+            self._filter.reset(index)
+        self._event_mask = _mask
+        self._inside  = 0
+        self._entered = 0
+        self._left    = 0
+        self._ranging.set_events(_mask)
+        if enabled and not _mask:
+            self._log.warning('no sensor supports event mode.')
+        self._log.info('sensor events {}.'.format('enabled' if _mask else 'disabled'))
+
+    def take_events_packed(self):
+        '''
+        Return the zone events as a packed message of one character per
+        sensor, 'E' having entered or 'L' left its zone since last taken,
+        otherwise 'i' inside or 'o' outside, or '.' if not in event mode;
+        the events are then cleared. The message is updated in place.
+        '''
+        buf = self._events_packed
+        for index in range(Sensor.SENSOR_COUNT):
+            mask = 1 << index
+            if not self._event_mask & mask:
+                c = 46  # '.'
+            elif self._entered & mask:
+                c = 69  # 'E'
+            elif self._left & mask:
+                c = 76  # 'L'
+            elif self._inside & mask:
+                c = 105 # 'i'
+            else:
+                c = 111 # 'o'
+            buf[index + 1] = c
+        buf[-1] = calculate_crc8(self._events_crc_view)
+        self._entered = 0
+        self._left    = 0
+        return buf
+
     def disable(self):
         if self._enabled:
             self._enabled = False
-            if self._task:
-                self._task.cancel()
-
-    async def _poll_loop(self):
-        self._log.info('starting poll loop…')
-        while self._enabled:
-            try:
-                if self._radiozoa:
-                    self._distances = tuple(
-                        v if v is not None else Sensor.OUT_OF_RANGE
-                        for v in self._radiozoa.get_distances()
-                    )
-                    self._distances_fmt = " ".join("{:04d}".format(v) for v in self._distances)
-                    self._distances_packed = pack_message(self._distances_fmt)
-                    for index, dist in enumerate(self._distances):
-                        _cardinal = Cardinal.from_id(index)
-                        _device = self._device_by_index[index]
-                        if _device.impl == "VL53L0X":
-                            _color = self._color_for_distance(_cardinal, dist, self._max_short_range_distance_mm)
-                        elif _device.impl == "VL53L1X":
-                            _color = self._color_for_distance(_cardinal, dist, self._max_long_range_distance_mm)
-                        else:
-                            raise ValueError("unrecognised sensor type: {}".format(_device.impl))
-                        if _color is not None:
-                            self._ring.set_color(_cardinal.pixel - 1, _color)
-                else:
-                    self._log.warning("no radiozoa: disabling…")
-                    self.disable()
-            except Exception as e:
-                self._log.error("{} raised in poll_loop: {}".format(type(e), e))
-            
-            await asyncio.sleep_ms(self._poll_delay_ms) 
-        self._log.info(Fore.MAGENTA + 'completed poll loop.')
+            self._scheduler.cancel(self._job)
+            self._log.info(Fore.MAGENTA + 'stopped poll job.')
+
+    def _poll(self):
+        '''
+        The scheduled poll job: reads a sensor signalled ready, if any, or
+        otherwise checks the sensor next due, reading it if a new measurement
+        is ready, then publishes the distances if any have changed and the
+        poll delay has elapsed.
+        '''
+        try:
+            if self._radiozoa:
+                index = None
+                if self._data_ready:
+                    if not self._signalled:
+                        self._signalled = self._data_ready.take()
+                    if self._signalled:
+                        index = 0
+                        while not (self._signalled >> index) & 1:
+                            index += 1
+                        self._signalled &= ~(1 << index)
+                _check = index is None
+                if _check:
+                    index = self._ranging.next_due()
+                dist = None
+                if index is not None:
+                    _cardinal = self._cardinals[index]
+                    dist = self._radiozoa.read_if_ready(_cardinal, _check)
+                    self._ranging.serviced(index, dist is not None)
+                if dist is not None:
+                    if (self._event_mask >> index) & 1:
+                        dist = self._event(index, _cardinal, dist)
+                    else:
+                        dist = self._filter.update(index, dist, self._radiozoa.range_status(_cardinal))
+                    if dist != self._readings[index]:
+                        self._readings[index] = dist
+                        self._changed |= 1 << index
+                if self._changed:
+                    _now = time.ticks_ms()
+                    if time.ticks_diff(_now, self._published_ms) >= self._poll_delay_ms:
+                        self._published_ms = _now
+                        self._publish()
+            else:
+                self._log.warning("no radiozoa: disabling…")
+                self.disable()
+        except Exception as e:
+            self._log.error("{} raised in poll: {}".format(type(e), e))
+
+    def _event(self, index, cardinal, dist):
+        '''
+        Handle a threshold event of a sensor in event mode, programming the
+        complementary window, and returning the distance to publish.
+        '''
+        mask = 1 << index
+        zone = self._zones[index]
+        if self._radiozoa.range_status(cardinal) != 0:
+            dist = Sensor.OUT_OF_RANGE
+        if self._inside & mask:
+            if dist < zone + Sensor.EVENT_HYSTERESIS_MM:
+                # measured before the window changed
+                return self._readings[index]
+            self._inside &= ~mask
+            self._entered &= ~mask
+            self._left |= mask
+            self._radiozoa.set_threshold(cardinal, zone, 0, _WINDOW_BELOW)
+            return Sensor.OUT_OF_RANGE
+        if dist >= zone:
+            return self._readings[index]
+        self._inside |= mask
+        self._left &= ~mask
+        self._entered |= mask
+        self._radiozoa.set_threshold(cardinal, 0, zone + Sensor.EVENT_HYSTERESIS_MM, _WINDOW_ABOVE)
+        return dist
+
+    def _publish(self):
+        '''
+        Publish the changed readings into the distances message, and display
+        any whose color bucket has changed on the ring.
+        '''
+        _changed = self._changed
+        self._changed = 0
+        _shown = False
+        for index in range(Sensor.SENSOR_COUNT):
+            if _changed & (1 << index):
+                dist = self._readings[index]
+                self._published[index] = dist
+                self._write_distance(index, dist)
+                bucket = self._bucket(index, dist)
+                if bucket != self._buckets[index]:
+                    self._buckets[index] = bucket
+                    _lut = self._luts[index]
+                    j = bucket * 3
+                    self._ring.set_rgb(self._pixels[index], _lut[j], _lut[j + 1], _lut[j + 2])
+                    _shown = True
+        self._distances_packed[-1] = calculate_crc8(self._crc_view)
+        if _shown:
+            # write the ring once for all sensors
+            self._ring.show()
+
+    @micropython.native
+    def _write_distance(self, index, dist):
+        '''
+        Write the distance as four digits into the distances message.
+        '''
+        buf = self._distances_packed
+        if dist > 9999:
+            dist = 9999
+        i = index * 5 + 4 # the last digit, after the length byte
+        for _ in range(4):
+            buf[i] = 48 + dist % 10
+            dist //= 10
+            i -= 1
+
+    def _bucket(self, index, dist):
+        '''
+        Return the color bucket of the sensor's distance, the last bucket
+        being out of range.
+        '''
+        max_mm = self._max_mm[index]
+        if dist > max_mm:
+            if not self._return_max_range:
+                return Sensor.COLOR_BUCKETS
+            dist = max_mm
+        return dist * (Sensor.COLOR_BUCKETS - 1) // max_mm
+
+    def _update_ranges(self):
+        '''
+        Set the maximum distance and color lookup table of each sensor, and
+        redisplay all on the ring.
+        '''
+        _luts = {}
+        for index in range(Sensor.SENSOR_COUNT):
+            max_mm = self._max_distance_mm(index)
+            if max_mm not in _luts:
+                _luts[max_mm] = self._color_lut(max_mm)
+            self._max_mm[index] = max_mm
+            self._luts[index]   = _luts[max_mm]
+            self._buckets[index] = 0xFF
+        self._changed = (1 << Sensor.SENSOR_COUNT) - 1
+
+    def _max_distance_mm(self, index):
+        impl = self._device_by_index[index].impl
+        if impl == "VL53L0X":
+            return self._max_short_range_distance_mm
+        elif impl == "VL53L1X":
+            if self._ranging and self._ranging.distance_mode(index) == RangingScheduler.SHORT_MODE:
+                return self._max_short_range_distance_mm
+            return self._max_long_range_distance_mm
+        raise ValueError("unrecognised sensor type: {}".format(impl))
+
+    def _color_lut(self, max_mm):
+        '''
+        Return the RGB colors of each bucket of distances up to max_mm, plus
+        out of range, as a bytearray.
+        '''
+        lut = bytearray(3 * (Sensor.COLOR_BUCKETS + 1))
+        for bucket in range(Sensor.COLOR_BUCKETS + 1):
+            dist = None if bucket == Sensor.COLOR_BUCKETS else bucket * max_mm // (Sensor.COLOR_BUCKETS - 1)
+            lut[bucket * 3:bucket * 3 + 3] = bytes(self._color_for_distance(None, dist, max_mm))
+        return lut
 
     def _color_for_distance(self, cardinal, distance, max_distance_mm):
         if distance is None or distance > max_distance_mm:
@@ -131,32 +554,7 @@ class Sensor:
                 return (0, 0, 0)
         if distance <= self._min_distance_mm:
             return (255, 0, 0)
-        ratio = distance / max_distance_mm
-        hue = ratio * 300
-        return self._hsv_to_rgb(hue, 1.0, 1.0)
-
-    def _hsv_to_rgb(self, h, s, v):
-        if s == 0:
-            val = int(v * 255)
-            return val, val, val
-        h = h % 360
-        h_sector = h // 60
-        f = (h / 60) - h_sector
-        p = v * (1 - s)
-        q = v * (1 - s * f)
-        t = v * (1 - s * (1 - f))
-        if h_sector == 0:
-            r, g, b = v, t, p
-        elif h_sector == 1:
-            r, g, b = q, v, p
-        elif h_sector == 2:
-            r, g, b = p, v, t
-        elif h_sector == 3:
-            r, g, b = p, q, v
-        elif h_sector == 4:
-            r, g, b = t, p, v
-        else:
-            r, g, b = v, p, q
-        return int(r * 255), int(g * 255), int(b * 255)
+        # red through to magenta (300° of 360°) across the range
+        return color_math.hsv_to_rgb(distance * 213 // max_distance_mm)
 
 #EOF
@@ -39,15 +39,24 @@ _PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI   = const(0x51)
 _FINAL_RANGE_CONFIG_VCSEL_PERIOD      = const(0x70)
 _FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI = const(0x71)
 
+_RESULT_BLOCK_LENGTH = const(12) # from the range status to the distance
+_RANGE_VALID         = const(11) # the device range status of a valid measurement
+
+DEFAULT_TIMING_BUDGET_US = const(33000) # as set by the sensor on reset
+
 class VL53L0X():
     def __init__(self, i2c, address=0x29):
         self._i2c = i2c
         self._address = address
+        # preallocated buffers for single byte and 16-bit register access
+        self._buf1 = bytearray(1)
+        self._buf2 = bytearray(2)
+        self._result = bytearray(_RESULT_BLOCK_LENGTH)
+        self._range_status = 255
+        self._signal_rate  = 0
         time.sleep_ms(100) # give the I2C time to init
         self.init()
         self._started = False
-        self._measurement_timing_budget_us = 0
-        self.set_measurement_timing_budget(self._measurement_timing_budget_us)
         self._enables = {"tcc": 0,
                         "dss": 0,
                         "msrc": 0,
@@ -63,6 +72,8 @@ class VL53L0X():
                          "final_range_us": 0
                          }
         self._vcsel_period_type = ["VcselPeriodPreRange", "VcselPeriodFinalRange"]
+        self._measurement_timing_budget_us = 0
+        self.set_measurement_timing_budget(DEFAULT_TIMING_BUDGET_US)
 
     def ping(self):
         self.start()
@@ -80,9 +91,26 @@ class VL53L0X():
         self._i2c.writeto_mem(self._address, register, data)
 
     def _register(self, register, value=None, struct='B'):
-        if value is None:
+        # single byte and big-endian 16-bit registers use preallocated buffers
+        if struct == 'B':
+            buf = self._buf1
+            if value is None:
+                self._i2c.readfrom_mem_into(self._address, register, buf)
+                return buf[0]
+            buf[0] = value & 0xFF
+        elif struct == '>H':
+            buf = self._buf2
+            if value is None:
+                self._i2c.readfrom_mem_into(self._address, register, buf)
+                return (buf[0] << 8) | buf[1]
+            buf[0] = (value >> 8) & 0xFF
+            buf[1] = value & 0xFF
+        elif value is None:
             return self._registers(register, struct=struct)[0]
-        self._registers(register, (value,), struct=struct)
+        else:
+            self._registers(register, (value,), struct=struct)
+            return
+        self._i2c.writeto_mem(self._address, register, buf)
 
     def _flag(self, register=0x00, bit=0, value=None):
         data = self._register(register)
@@ -258,10 +286,57 @@ class VL53L0X():
             time.sleep_ms(1)
         else:
             raise TimeoutError()
-        value = self._register(_RESULT_RANGE_STATUS + 10, struct='>H')
+        value = self.read_result()
+        self._register(_INTERRUPT_CLEAR, 0x01)
+        return value
+
+    def check_for_data_ready(self):
+        '''
+        Returns 1 if a new measurement is ready, 0 if not.
+        '''
+        return 1 if self._register(_RESULT_INTERRUPT_STATUS) & 0x07 else 0
+
+    def read_if_ready(self, check=True):
+        '''
+        Returns the distance in mm if a new measurement is ready, otherwise
+        None, without waiting. Requires continuous ranging (see start()). If
+        check is False, data ready is assumed, as when signalled on GPIO1.
+        '''
+        if not self._started or (check and not self.check_for_data_ready()):
+            return None
+        value = self.read_result()
         self._register(_INTERRUPT_CLEAR, 0x01)
         return value
 
+    @property
+    def range_status(self):
+        '''
+        The range status of the last reading by read_result(), 0 if valid.
+        '''
+        return self._range_status
+
+    @property
+    def signal_rate(self):
+        '''
+        The signal rate in kcps of the last reading by read_result().
+        '''
+        return self._signal_rate
+
+    def read_result(self):
+        '''
+        Reads the range status, signal rate and distance of the latest
+        measurement in a single I2C transaction, the status and signal rate
+        being available afterwards as range_status and signal_rate. Returns
+        the distance in mm.
+        '''
+        buf = self._result
+        self._i2c.readfrom_mem_into(self._address, _RESULT_RANGE_STATUS, buf)
+        status = (buf[0] & 0x78) >> 3
+        self._range_status = 0 if status == _RANGE_VALID else (status or 255)
+        # signal rate is 9.7 fixed point MCPS
+        self._signal_rate  = (((buf[6] << 8) | buf[7]) * 1000) >> 7
+        return (buf[10] << 8) | buf[11]
+
     def set_signal_rate_limit(self, limit_Mcps):
         if limit_Mcps < 0 or limit_Mcps > 511.99:
             return False
@@ -292,9 +367,9 @@ class VL53L0X():
             self._register(_PRE_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
             self._register(_PRE_RANGE_CONFIG_VCSEL_PERIOD, vcsel_period_reg)
             new_pre_range_timeout_mclks = self.timeout_microseconds_to_Mclks(self._timeouts["pre_range_us"], period_pclks)
-            self._register(_PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(new_pre_range_timeout_mclks))
+            self._register(_PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(new_pre_range_timeout_mclks), struct='>H')
             new_msrc_timeout_mclks = self.timeout_microseconds_to_Mclks(self._timeouts["msrc_dss_tcc_us"], period_pclks)
-            self._register(_MSRC_CONFIG_TIMEOUT_MACROP, 255 if new_msrc_timeout_mclks > 256 else (new_msrc_timeout_mclks - 1))
+            self._register(_MSRC_CONFIG_TIMEOUT_MACROP, 255 if new_msrc_timeout_mclks > 256 else int(new_msrc_timeout_mclks - 1))
         elif type == self._vcsel_period_type[1]:
             if period_pclks == 8:
                 self._register(_FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, 0x10)
@@ -335,7 +410,7 @@ class VL53L0X():
             new_final_range_timeout_mclks = self.timeout_microseconds_to_Mclks(self._timeouts["final_range_us"], period_pclks)
             if self._enables["pre_range"]:
                 new_final_range_timeout_mclks += 1
-            self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(new_final_range_timeout_mclks))
+            self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(new_final_range_timeout_mclks), struct='>H')
         else:
             return False
         self.set_measurement_timing_budget(self._measurement_timing_budget_us)
@@ -355,9 +430,9 @@ class VL53L0X():
 
     def get_vcsel_pulse_period(self, type):
         if type == self._vcsel_period_type[0]:
-            return self.decode_Vcsel_period(0x50)
+            return self.decode_Vcsel_period(self._register(_PRE_RANGE_CONFIG_VCSEL_PERIOD))
         elif type == self._vcsel_period_type[1]:
-            return self.decode_Vcsel_period(0x70)
+            return self.decode_Vcsel_period(self._register(_FINAL_RANGE_CONFIG_VCSEL_PERIOD))
         else:
             return 255
 
@@ -365,10 +440,10 @@ class VL53L0X():
         self._timeouts["pre_range_vcsel_period_pclks"] = self.get_vcsel_pulse_period(self._vcsel_period_type[0])
         self._timeouts["msrc_dss_tcc_mclks"] = int(self._register(_MSRC_CONFIG_TIMEOUT_MACROP)) + 1
         self._timeouts["msrc_dss_tcc_us"] = self.timeout_Mclks_to_microseconds(self._timeouts["msrc_dss_tcc_mclks"], self._timeouts[ "pre_range_vcsel_period_pclks"])
-        self._timeouts["pre_range_mclks"] = self.decode_timeout(_PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI)
+        self._timeouts["pre_range_mclks"] = self.decode_timeout(self._register(_PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI, struct='>H'))
         self._timeouts["pre_range_us"] = self.timeout_Mclks_to_microseconds(self._timeouts["pre_range_mclks"], self._timeouts[ "pre_range_vcsel_period_pclks"])
         self._timeouts["final_range_vcsel_period_pclks"] = self.get_vcsel_pulse_period(self._vcsel_period_type[1])
-        self._timeouts["final_range_mclks"] = self.decode_timeout(self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI))
+        self._timeouts["final_range_mclks"] = self.decode_timeout(self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, struct='>H'))
         if self._enables["pre_range"]:
             self._timeouts["final_range_mclks"] -= self._timeouts["pre_range_mclks"]
         self._timeouts["final_range_us"] = self.timeout_Mclks_to_microseconds(self._timeouts["final_range_mclks"], self._timeouts[ "final_range_vcsel_period_pclks"])
@@ -397,7 +472,7 @@ class VL53L0X():
             while (ls_byte & 0xFFFFFF00) > 0:
                 ls_byte >>= 1
                 ms_byte += 1
-            return (ms_byte << 8) or (ls_byte & 0xFF)
+            return (ms_byte << 8) | (ls_byte & 0xFF)
         else:
             return 0
 
@@ -431,7 +506,7 @@ class VL53L0X():
             final_range_timeout_mclks = self.timeout_microseconds_to_Mclks(final_range_timeout_us, self._timeouts["final_range_vcsel_period_pclks"])
             if self._enables["pre_range"]:
                 final_range_timeout_mclks += self._timeouts["pre_range_mclks"]
-            self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(final_range_timeout_mclks))
+            self._register(_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, self.encode_timeout(final_range_timeout_mclks), struct='>H')
             self._measurement_timing_budget_us = budget_us
         return True
 
@@ -7,7 +7,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-02-17
-# modified: 2026-02-17
+# modified: 2026-10-19
 #
 # changes: general cleanup; added methods for compatibility with existing API;
 # unused constants have been removed; root-level constants now underscored.
@@ -94,7 +94,7 @@ _VL53L1_IDENTIFICATION__MODEL_ID =                    0x010F
 _DISTANCE_MODE_SHORT =                                1
 _DISTANCE_MODE_LONG =                                 2
 
-_VL51L1X_DEFAULT_CONFIGURATION = [
+_VL51L1X_DEFAULT_CONFIGURATION = bytes([
 0x00, 0x01, 0x01, 0x01, 0x02, 0x00, 0x02, 0x08, 0x00, 0x08,
 0x10, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0xff, 0x00, 0x0F,
 0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x0b, 0x00, 0x00, 0x02,
@@ -105,7 +105,9 @@ _VL51L1X_DEFAULT_CONFIGURATION = [
 0x00, 0x00, 0x00, 0x00, 0x01, 0x0f, 0x0d, 0x0e, 0x0e, 0x00,
 0x00, 0x02, 0xc7, 0xff, 0x9B, 0x00, 0x00, 0x00, 0x01, 0x00,
 0x00
-]
+])
+_DEFAULT_CONFIGURATION_START = 0x2D # the first register of the default configuration
+_BOOT_TIMEOUT_MS = 200
 
 # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 # VL53L1_define_Error_group Error and Warning code returned by API
@@ -114,9 +116,21 @@ _VL51L1X_DEFAULT_CONFIGURATION = [
 _VL53L1_ERROR_NONE =       0
 _VL53L1_ERROR_TIME_OUT =  -7
 
+# the result block read by read_result(), from the range status to the signal rate
+_RESULT_BLOCK_LENGTH = _VL53L1_RESULT__PEAK_SIGNAL_COUNT_RATE_CROSSTALK_CORRECTED_MCPS_SD0 + 2 - _VL53L1_RESULT__RANGE_STATUS
+_RESULT_DISTANCE_OFFSET = _VL53L1_RESULT__FINAL_CROSSTALK_CORRECTED_RANGE_MM_SD0 - _VL53L1_RESULT__RANGE_STATUS
+_RESULT_SIGNAL_OFFSET = _VL53L1_RESULT__PEAK_SIGNAL_COUNT_RATE_CROSSTALK_CORRECTED_MCPS_SD0 - _VL53L1_RESULT__RANGE_STATUS
+
+# maps the device's range status (low 5 bits) to the API range status, 255 if unknown
+_RANGE_STATUS_MAP = bytearray(b'\xff' * 32)
+for _device_status, _api_status in ((9, 0), (6, 1), (4, 2), (8, 3), (5, 4), (3, 5), (19, 6),
+        (7, 7), (12, 9), (18, 10), (22, 11), (23, 12), (13, 13)):
+    _RANGE_STATUS_MAP[_device_status] = _api_status
+
 # class representing a VL53L1 sensor component
 class VL53L1X:
     DEFAULT_DEVICE_ADDRESS = 0x29
+    CONFIG_CHUNK_SIZE = 0 # bytes per default configuration write, 0 for a single write
     # software version information
     VL53L1X_IMPLEMENTATION_VER_MAJOR =       1
     VL53L1X_IMPLEMENTATION_VER_MINOR =       0
@@ -143,7 +157,12 @@ class VL53L1X:
         self._distance_mode = distance_mode
         self._timing_budget_ms = timing_budget_ms
         self._status = 0
-        time.sleep_ms(100)
+        # preallocated I2C buffers, by transfer size
+        self._buffers = {1: bytearray(1), 2: bytearray(2), 4: bytearray(4)}
+        self._result  = bytearray(_RESULT_BLOCK_LENGTH)
+        self._interrupt_polarity = None # cached, as it only changes via set_interrupt_polarity()
+        self._range_status = 255
+        self._signal_rate  = 0
         self.init()
         self._started = False
 
@@ -152,17 +171,13 @@ class VL53L1X:
         initialize the sensor with default values.
         '''
         self._status = 0
-        sensorState = 0
-        # wait for boot
-        timeout_count = 0
-        while not sensorState and not self._status:
-            sensorState = self.boot_state()
-            time.sleep_ms(2)
-            timeout_count += 1
-            if timeout_count > 100:
+        # wait for boot, treating a NACK as not yet booted
+        deadline = time.ticks_add(time.ticks_ms(), _BOOT_TIMEOUT_MS)
+        while not self.boot_state() or self._status:
+            if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
                 raise TimeoutError()
-        if not self._status:
-            self._status = self.sensor_init()
+            time.sleep_ms(1)
+        self._status = self.sensor_init()
         # set distance mode
         if self._distance_mode in [1, 2]:
             self.set_distance_mode(self._distance_mode)
@@ -175,8 +190,12 @@ class VL53L1X:
 
     def start(self, period=0):
         '''
-        start continuous ranging (compatible with VL53L0X API).
+        start continuous ranging (compatible with VL53L0X API), with a
+        measurement every period ms if non-zero, which must be no less
+        than the timing budget.
         '''
+        if period:
+            self.set_inter_measurement_in_ms(period)
         self.start_ranging()
         self._started = True
         return self._status
@@ -206,7 +225,7 @@ class VL53L1X:
                 timeout += 1
                 if timeout > 1000:
                     raise TimeoutError()
-            distance = self.get_distance()
+            distance = self.read_result()
             self.clear_interrupt()
             self.stop_ranging()
         else:
@@ -217,11 +236,63 @@ class VL53L1X:
                 timeout += 1
                 if timeout > 1000:
                     raise TimeoutError()
-            distance = self.get_distance()
+            distance = self.read_result()
             self.clear_interrupt()
         
         return distance
 
+    def read_if_ready(self, check=True):
+        '''
+        read distance in mm if a new measurement is ready, without waiting.
+        requires continuous ranging (see start()). if check is False, data
+        ready is assumed, as when signalled on GPIO1, saving a bus read.
+
+        Returns:
+            int: distance in millimeters, or None if no new measurement is ready
+        '''
+        if not self._started or (check and not self.check_for_data_ready()):
+            return None
+        distance = self.read_result()
+        self.clear_interrupt()
+        return distance
+
+    @property
+    def range_status(self):
+        '''
+        The range status of the last reading by read_result(), 0 if valid.
+        '''
+        return self._range_status
+
+    @property
+    def signal_rate(self):
+        '''
+        The signal rate in kcps of the last reading by read_result().
+        '''
+        return self._signal_rate
+
+    def read_result(self):
+        '''
+        read the range status, distance and signal rate of the latest
+        measurement in a single I2C transaction, the status and signal rate
+        being available afterwards as range_status and signal_rate.
+
+        Returns:
+            int: distance in millimeters
+        '''
+        self._status = 0
+        buf = self._result
+        try:
+            self._i2c.readfrom_mem_into(self._address, _VL53L1_RESULT__RANGE_STATUS, buf, addrsize=16)
+        except Exception as e:
+            if self._debug:
+                print("I2C read error: {}".format(e))
+            self._status = 1
+            self._range_status = 255
+            return 0
+        self._range_status = _RANGE_STATUS_MAP[buf[0] & 0x1F]
+        self._signal_rate  = ((buf[_RESULT_SIGNAL_OFFSET] << 8) | buf[_RESULT_SIGNAL_OFFSET + 1]) * 8
+        return (buf[_RESULT_DISTANCE_OFFSET] << 8) | buf[_RESULT_DISTANCE_OFFSET + 1]
+
     # VL53L1X native methods ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
     def get_distance(self):
@@ -263,16 +334,26 @@ class VL53L1X:
 
     def sensor_init(self):
         '''
-        This function loads the 135 bytes default values to initialize the sensor.
+        This function loads the 91 bytes of default values to initialize the sensor,
+        as a single auto-incrementing write (or in chunks of CONFIG_CHUNK_SIZE).
 
         @return Integer 0 on success or error code
         '''
         self._status = 0
-        Addr = 0x00
         tmp = 0
         timeout = 0
-        for Addr in range(0x2D, 0x87 + 1):
-            self._status = self.__i2cWrite(self._address, Addr, _VL51L1X_DEFAULT_CONFIGURATION[Addr - 0x2D], 1)
+        config = memoryview(_VL51L1X_DEFAULT_CONFIGURATION)
+        chunk = self.CONFIG_CHUNK_SIZE or len(config)
+        for offset in range(0, len(config), chunk):
+            try:
+                self._i2c.writeto_mem(self._address, _DEFAULT_CONFIGURATION_START + offset,
+                        config[offset:offset + chunk], addrsize=16)
+            except Exception as e:
+                if self._debug:
+                    print("I2C write error: {}".format(e))
+                self._status = 1
+                return self._status
+        self._interrupt_polarity = None # the default configuration includes the GPIO mux
         self._status = self.start_ranging()
 #       while(tmp == 0):
 #           tmp = self.check_for_data_ready()
@@ -283,8 +364,8 @@ class VL53L1X:
             tmp = self.check_for_data_ready()
             timeout = timeout + 1
             if (timeout > 50):
-                self.status = _VL53L1_ERROR_TIME_OUT                      
-                return self.status
+                self._status = _VL53L1_ERROR_TIME_OUT
+                return self._status
         tmp = 0
         self._status = self.clear_interrupt()
         self._status = self.stop_ranging()
@@ -311,19 +392,24 @@ class VL53L1X:
         Temp = self.__i2cRead(self._address, _GPIO_HV_MUX__CTRL, 1)
         Temp = Temp & 0xEF
         self._status = self.__i2cWrite(self._address, _GPIO_HV_MUX__CTRL, Temp | (not (NewPolarity & 1)) << 4, 1)
+        self._interrupt_polarity = None
         return self._status
 
     def get_interrupt_polarity(self):
         '''
-        This function returns the current interrupt polarity.
+        This function returns the current interrupt polarity, read from the
+        device once and cached thereafter.
 
         @return Integer 1 = active high (default), 0 = active low
         '''
         self._status = 0
-        Temp = self.__i2cRead(self._address, _GPIO_HV_MUX__CTRL, 1)
-        Temp = Temp & 0x10
-        pInterruptPolarity = not (Temp >> 4)
-        return pInterruptPolarity
+        if self._interrupt_polarity is None:
+            Temp = self.__i2cRead(self._address, _GPIO_HV_MUX__CTRL, 1)
+            if self._status:
+                return 1 # don't cache a failed read
+            Temp = Temp & 0x10
+            self._interrupt_polarity = 0 if Temp >> 4 else 1
+        return self._interrupt_polarity
 
     def start_ranging(self):
         '''
@@ -353,14 +439,13 @@ class VL53L1X:
         @return Integer 1 if new data is ready, 0 if not
         '''
         self._status = 0
+        isDataReady = 0
         IntPol = self.get_interrupt_polarity()
         Temp = self.__i2cRead(self._address, _GPIO__TIO_HV_STATUS, 1)
         # read in the register to check if a new value is available
         if (self._status == 0):
             if ((Temp & 1) == IntPol):
                 isDataReady = 1
-            else:
-                isDataReady = 0
         return isDataReady
 
     def set_timing_budget_in_ms(self, TimingBudgetInMs):
@@ -623,13 +708,7 @@ class VL53L1X:
         '''
         self._status = 0
         RgSt = self.__i2cRead(self._address, _VL53L1_RESULT__RANGE_STATUS, 1)
-        RgSt = RgSt&0x1F
-
-        def get_range_status_switch(var):
-            switcher = { 9:0, 6:1, 4:2, 8:3, 5:4, 3:5, 19:6, 7:7, 12:9, 18:10, 22:11, 23:12, 13:13}
-            return switcher.get(var,255)
-        rangeStatus = get_range_status_switch(RgSt)
-        return rangeStatus
+        return _RANGE_STATUS_MAP[RgSt & 0x1F]
 
     def set_offset(self, OffsetValue):
         '''
@@ -753,6 +832,14 @@ class VL53L1X:
         high = self.__i2cRead(self._address,_SYSTEM__THRESH_HIGH, 2)
         return high
 
+    def clear_distance_threshold(self):
+        '''
+        This function disables threshold detection, restoring the default
+        interrupt on every new measurement.
+        '''
+        self._status = self.__i2cWrite(self._address, _SYSTEM__INTERRUPT_CONFIG_GPIO, 0x20, 1)
+        return self._status
+
     def set_roi(self, X, Y, OpticalCenter = 199):
         '''
         This function programs the ROI (Region of Interest). The height and width of the ROI (X, Y)
@@ -1002,61 +1089,46 @@ class VL53L1X:
 
     def __i2cWrite(self, address, register, data, nbytes):
         '''
-        wrapper for standard MicroPython I2C. Handles 16-bit register addresses.
+        wrapper for standard MicroPython I2C, writing big-endian data to a
+        16-bit register address from a preallocated buffer.
         '''
-        registerMSB = (register >> 8) & 0xFF
-        registerLSB = register & 0xFF
-        
-        buffer = bytearray([registerMSB, registerLSB])
-        
-        if nbytes == 4:
-            buffer.extend([(data >> 24) & 0xFF, (data >> 16) & 0xFF, 
-                           (data >> 8) & 0xFF, data & 0xFF])
-        elif nbytes == 2:
-            buffer.extend([(data >> 8) & 0xFF, data & 0xFF])
-        elif nbytes == 1:
-            buffer.append(data & 0xFF)
-        else:
+        buf = self._buffers.get(nbytes)
+        if buf is None:
             if self._debug:
                 print("__i2cWrite: invalid nbytes")
             return 1
-        
+        for i in range(nbytes):
+            buf[i] = (data >> (8 * (nbytes - 1 - i))) & 0xFF
         try:
-            self._i2c.writeto(address, buffer)
+            self._i2c.writeto_mem(address, register, buf, addrsize=16)
             self._status = 0
         except Exception as e:
             if self._debug:
                 print("I2C write error: {}".format(e))
             self._status = 1
-        
         return self._status
 
     def __i2cRead(self, address, register, nbytes):
         '''
-        wrapper for standard MicroPython I2C. Handles 16-bit register addresses.
+        wrapper for standard MicroPython I2C, reading big-endian data from a
+        16-bit register address into a preallocated buffer.
         '''
-        registerMSB = (register >> 8) & 0xFF
-        registerLSB = register & 0xFF
-        
-        if nbytes not in [1, 2, 4]:
+        buf = self._buffers.get(nbytes)
+        if buf is None:
             if self._debug:
                 print("__i2cRead: invalid nbytes")
             return 0
-        
         try:
-            # Write register address then read - as separate I2C transactions
-            self._i2c.writeto(address, bytearray([registerMSB, registerLSB]))
-            data_bytes = self._i2c.readfrom(address, nbytes)
-            
-            # Convert bytes to integer (big-endian for VL53L1X)
-            data = 0
-            for byte_val in data_bytes:
-                data = (data << 8) | byte_val
-            
-            return data
+            self._i2c.readfrom_mem_into(address, register, buf, addrsize=16)
         except Exception as e:
             if self._debug:
                 print("I2C read error: {}".format(e))
+            self._status = 1
             return 0
+        if nbytes == 1:
+            return buf[0]
+        elif nbytes == 2:
+            return (buf[0] << 8) | buf[1]
+        return (buf[0] << 24) | (buf[1] << 16) | (buf[2] << 8) | buf[3]
 
 #EOF
@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import rgb_from_hsv
+from color_math import hsv_to_rgb
 
 
 class RGBFX:
@@ -24,5 +24,4 @@ class HSVFX:
         self.val = val
 
     def __call__(self):
-        r, g, b = rgb_from_hsv(self.hue, self.sat, self.val)
-        return int(r * 255), int(g * 255), int(b * 255)
+        return hsv_to_rgb(int(self.hue * 256) & 0xFF, int(self.sat * 255), int(self.val * 255))
@@ -2,7 +2,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Cycling, rgb_from_hsv
+from picofx import Cycling
+from color_math import hsv_to_rgb
 
 
 class RainbowFX(Cycling):
@@ -12,8 +13,7 @@ class RainbowFX(Cycling):
         self.val = val
 
     def __call__(self):
-        r, g, b = rgb_from_hsv(self.__offset, self.sat, self.val)
-        return int(r * 255), int(g * 255), int(b * 255)
+        return hsv_to_rgb(int(self.__offset * 256) & 0xFF, int(self.sat * 255), int(self.val * 255))
 
 
 class RainbowWaveFX(Cycling):
@@ -28,6 +28,5 @@ class RainbowWaveFX(Cycling):
             nonlocal pos
             phase = pos / self.length
             hue = (self.__offset + phase) % 1.0
-            r, g, b = rgb_from_hsv(hue, self.sat, self.val)
-            return int(r * 255), int(g * 255), int(b * 255)
+            return hsv_to_rgb(int(hue * 256) & 0xFF, int(self.sat * 255), int(self.val * 255))
         return self, fx
@@ -2,7 +2,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Updateable, rgb_from_hsv
+from picofx import Updateable
+from color_math import hsv_to_rgb
 
 
 class HueStepFX(Updateable):
@@ -17,8 +18,7 @@ class HueStepFX(Updateable):
 
     def __call__(self):
         hue = (self.start_hue + (self.__current_step / self.__steps)) % 1.0
-        r, g, b = rgb_from_hsv(hue, self.sat, self.val)
-        return int(r * 255), int(g * 255), int(b * 255)
+        return hsv_to_rgb(int(hue * 256) & 0xFF, int(self.sat * 255), int(self.val * 255))
 
     def tick(self, delta_ms):
         self.__time += delta_ms
@@ -6,13 +6,10 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-02-09
-# modified: 2026-02-12
+# modified: 2026-10-19
 
 import os
-import asyncio
 import time
-from machine import Timer
-from collections import deque
 from controller import Controller
 from colors import *
 from pixel import Pixel
@@ -41,6 +38,13 @@ class TinyFxPixel:
         else:
             print("ERROR: unknown color name: {}".format(color))
 
+    def set(self, index=None, color=None):
+        # the RGB LED is set directly, so there's no frame to defer
+        self.set_color(index, color)
+
+    def show(self):
+        return False
+
 class TinyFxController(Controller):
     '''
     An implementation using a WeAct STM32F405 optionally connected to a NeoPixel
@@ -81,26 +85,10 @@ class TinyFxController(Controller):
             'ch5': self._channel5_fx,
             'ch6': self._channel6_fx
         }
-        # heartbeat feature
-        self._heartbeat_enabled     = False
-        self._heartbeat_on_time_ms  = 50
-        self._heartbeat_off_time_ms = 2950
-        self._heartbeat_timer = 0
-        self._heartbeat_state = False
-        self._stop_at = None
-        self._pixel_persist = False
-        # instantiate ring
-        self._timer0 = Timer() # no ID on RP2
-        self._services_started   = False
         # PIR sensor (no Timer: you can poll it manually if used)
 #       self._pir_sensor    = PassiveInfrared()
         self._pir_triggered = False
         self._pir_enabled   = False # default disabled
-        # start asyncio private dispatcher
-        self._loop        = asyncio.get_event_loop()
-        self._queue       = deque((), 8)
-        self._busy        = False
-        self._loop.create_task(self._dispatcher())
         self._play('arming-tone')
         print('ready.')
 
@@ -113,29 +101,6 @@ class TinyFxController(Controller):
         self._show_color(COLOR_BLACK)
         return self._pixel
 
-    def _enqueue(self, fn, *args, **kwargs):
-        self._queue.append((fn, args, kwargs))
-        return True
-
-    async def _dispatcher(self):
-        while True:
-            if self._queue and not self._busy:
-                fn, args, kwargs = self._queue.popleft()
-                self._busy = True
-                try:
-                    fn(*args, **kwargs)
-                except Exception as e:
-                    print("{} raised processing job: {}".format(type(e), e))
-                finally:
-                    self._busy = False
-            await asyncio.sleep_ms(0)
-
-    def _create_pixel_timer(self):
-        from machine import Timer
-
-        self._pixel_timer = Timer()
-        self._pixel_timer.init(freq=self._pixel_timer_freq_hz, callback=self._led_off)
-
     # TinyFX ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
     def _get_channel(self, channel, blinking=False):
@@ -167,29 +132,16 @@ class TinyFxController(Controller):
     def tick(self, delta_ms):
         # TinyFX PWM
         self._player.update(delta_ms)
-        if self._heartbeat_enabled:
-            self._heartbeat(delta_ms)
-        if self._stop_at is not None:
-            if time.ticks_diff(time.ticks_ms(), self._stop_at) >= 0:
-                self._stop_at = None
-                if not self._pixel_persist:
-                    self._show_color(COLOR_BLACK)
-        if self._AUTOSTART_SERVICES and not self._services_started:
-            if time.ticks_diff(time.ticks_ms(), self._startup_ms) >= self._AUTOSTART_DELAY_MS:
-                self._services_started = True
-                self._start_services()
-
-    def set_slave(self, slave):
-        self._slave = slave
-        self._slave.add_callback(self._on_command)
+        # then heartbeat, pixel off and other scheduled jobs
+        super().tick(delta_ms)
 
     def print_help(self):
         super().print_help()
         print('''    all on | off                            # turn all LED channels on or off
     ch[1-6] on | off                        # turn an LED channel on or off
-    play <name>                             # play a sound
-    sounds                                  # display available sounds
-    colors                                  # display available colors
+    play <name>                             # play a sound (as a job)
+    sounds                                  # display available sounds (as a job)
+    colors                                  # display available colors (as a job)
 ''')
 
     def pre_process(self, cmd, arg0, arg1, arg2, arg3, arg4):
@@ -240,16 +192,13 @@ class TinyFxController(Controller):
                     return Controller._PACKED_ERR, COLOR_RED
 
         elif arg0 == "play":
-            self._enqueue(self._play, cmd)
-            return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            return self._accept(self._play, (cmd,)), COLOR_DARK_GREEN
 
         elif arg0 == "sounds":
-            self._enqueue(self._sound_cat)
-            return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            return self._accept(self._sound_cat), COLOR_DARK_GREEN
         
         elif arg0 == "colors":
-            self._enqueue(self._color_cat)
-            return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            return self._accept(self._color_cat), COLOR_DARK_GREEN
 
         else:
             return None, None
@@ -292,6 +241,7 @@ class TinyFxController(Controller):
             print('playing: {}…'.format(sound_name))
         except Exception as e:
             print("sound name '{}' not found.".format(sound_name))
+            return 'not found' # the job result
         finally:
             self._playing = False
 
@@ -0,0 +1,136 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# On-device micro-benchmarks of color_math against the float HSV routines it
+# replaced. Run with 'mpremote run bench_color.py' after copying color_math.py.
+
+import gc
+import time
+
+import color_math
+
+ITERATIONS = 2000
+PIXELS     = 24
+
+def float_hsv_to_rgb(h, s=1.0, v=1.0):
+    # the former Pixel.hsv_to_rgb(), hue 0.0-1.0
+    i = int(h * 6)
+    f = (h * 6) - i
+    p = int(v * (1 - s) * 255)
+    q = int(v * (1 - f * s) * 255)
+    t = int(v * (1 - (1 - f) * s) * 255)
+    v = int(v * 255)
+    i %= 6
+    if i == 0:
+        return (v, t, p)
+    elif i == 1:
+        return (q, v, p)
+    elif i == 2:
+        return (p, v, t)
+    elif i == 3:
+        return (p, q, v)
+    elif i == 4:
+        return (t, p, v)
+    else:
+        return (v, p, q)
+
+def float_sector_hsv_to_rgb(h, s, v):
+    # the former Sensor._hsv_to_rgb(), hue in degrees
+    h = h % 360
+    h_sector = h // 60
+    f = (h / 60) - h_sector
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+    if h_sector == 0:
+        r, g, b = v, t, p
+    elif h_sector == 1:
+        r, g, b = q, v, p
+    elif h_sector == 2:
+        r, g, b = p, v, t
+    elif h_sector == 3:
+        r, g, b = p, q, v
+    elif h_sector == 4:
+        r, g, b = t, p, v
+    else:
+        r, g, b = v, p, q
+    return int(r * 255), int(g * 255), int(b * 255)
+
+def bench(name, fn):
+    gc.collect()
+    mem_before = gc.mem_free()
+    start = time.ticks_us()
+    fn()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    allocated = mem_before - gc.mem_free()
+    print("{:<28} {:>7.2f}µs/call {:>7} bytes".format(name, elapsed / ITERATIONS, allocated))
+
+def run_float_hsv():
+    for i in range(ITERATIONS):
+        float_hsv_to_rgb((i & 0xFF) / 256, 1.0, 0.5)
+
+def run_float_sector():
+    for i in range(ITERATIONS):
+        float_sector_hsv_to_rgb((i & 0xFF) * 1.40625, 1.0, 0.5)
+
+def run_int_hsv():
+    for i in range(ITERATIONS):
+        color_math.hsv_to_rgb(i, 255, 128)
+
+def run_float_scale():
+    rgb = (200, 100, 50)
+    for i in range(ITERATIONS):
+        level = (i & 0xFF) / 255
+        (int(rgb[0] * level), int(rgb[1] * level), int(rgb[2] * level))
+
+def run_int_scale():
+    rgb = (200, 100, 50)
+    for i in range(ITERATIONS):
+        color_math.scale(rgb, i & 0xFF)
+
+def run_int_blend():
+    a, b = (200, 100, 50), (0, 50, 250)
+    for i in range(ITERATIONS):
+        color_math.blend(a, b, i & 0xFF)
+
+def run_float_rainbow_frame():
+    buf = bytearray(3 * PIXELS)
+    for i in range(ITERATIONS // PIXELS):
+        for n in range(PIXELS):
+            buf[n * 3:n * 3 + 3] = bytes(float_hsv_to_rgb(((i + n) % PIXELS) / PIXELS))
+
+def run_int_rainbow_frame():
+    buf = bytearray(3 * PIXELS)
+    for i in range(ITERATIONS // PIXELS):
+        color_math.hue_fill(buf, PIXELS, i << 8, (256 << 8) // PIXELS, 255)
+
+def run_int_blend_frame():
+    dst = bytearray(3 * PIXELS)
+    src = bytearray(b'\xff' * (3 * PIXELS))
+    for i in range(ITERATIONS // PIXELS):
+        color_math.blend_buffer(dst, src, 3 * PIXELS, i & 0xFF)
+
+try:
+    print("color benchmarks, {} iterations (frames: {} pixels, per pixel):".format(ITERATIONS, PIXELS))
+    bench('float hsv_to_rgb',           run_float_hsv)
+    bench('float hsv_to_rgb (degrees)', run_float_sector)
+    bench('color_math.hsv_to_rgb',      run_int_hsv)
+    bench('float scale',                run_float_scale)
+    bench('color_math.scale',           run_int_scale)
+    bench('color_math.blend',           run_int_blend)
+    bench('float rainbow frame',        run_float_rainbow_frame)
+    bench('color_math.hue_fill',        run_int_rainbow_frame)
+    bench('color_math.blend_buffer',    run_int_blend_frame)
+
+except Exception as e:
+    print('ERROR: {} raised by bench_color: {}'.format(type(e), e))
+
+#EOF
@@ -0,0 +1,136 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Integer color arithmetic: an 8-bit hue wheel, HSV to RGB, scaling and blending.
+#
+# Hue, saturation, value, levels and blend ratios are all integers from 0 to
+# 255, where a hue of 256 is a full turn of the wheel (so hues wrap with & 0xFF).
+# Nothing here uses floats, and the per-color functions allocate only the
+# returned tuple.
+
+import micropython
+
+def _build_wheel():
+    '''
+    Return the fully saturated, full value RGB of each of the 256 hues as a
+    768 byte table, red at 0, green at 85 and blue at 171.
+    '''
+    wheel = bytearray(768)
+    for h in range(256):
+        sector, f = divmod(h * 6, 256) # f is the position within the sector, 0-255
+        rising, falling = f, 255 - f
+        if sector == 0:
+            rgb = (255, rising, 0)
+        elif sector == 1:
+            rgb = (falling, 255, 0)
+        elif sector == 2:
+            rgb = (0, 255, rising)
+        elif sector == 3:
+            rgb = (0, falling, 255)
+        elif sector == 4:
+            rgb = (rising, 0, 255)
+        else:
+            rgb = (255, 0, falling)
+        wheel[h * 3:h * 3 + 3] = bytes(rgb)
+    return wheel
+
+WHEEL = _build_wheel()
+
+@micropython.native
+def _div255(x):
+    # x / 255, exact for 0 <= x <= 65535
+    return (x + 1 + (x >> 8)) >> 8
+
+@micropython.native
+def wheel(h):
+    '''
+    Return the fully saturated, full value RGB tuple of the hue.
+    '''
+    j = (h & 0xFF) * 3
+    return (WHEEL[j], WHEEL[j + 1], WHEEL[j + 2])
+
+@micropython.native
+def hsv_to_rgb(h, s=255, v=255):
+    '''
+    Return the RGB tuple of the hue, saturation and value, each 0-255.
+    '''
+    j = (h & 0xFF) * 3
+    r, g, b = WHEEL[j], WHEEL[j + 1], WHEEL[j + 2]
+    if s < 255:
+        # lift toward white as saturation falls
+        r = 255 - _div255((255 - r) * s)
+        g = 255 - _div255((255 - g) * s)
+        b = 255 - _div255((255 - b) * s)
+    if v < 255:
+        r = _div255(r * v)
+        g = _div255(g * v)
+        b = _div255(b * v)
+    return (r, g, b)
+
+@micropython.native
+def scale(rgb, level):
+    '''
+    Return the RGB tuple scaled by level, 0-255.
+    '''
+    return (_div255(rgb[0] * level), _div255(rgb[1] * level), _div255(rgb[2] * level))
+
+@micropython.native
+def blend(a, b, t):
+    '''
+    Return the mix of RGB tuples a and b, from all a at t=0 to all b at t=255.
+    '''
+    u = 255 - t
+    return (_div255(a[0] * u + b[0] * t),
+            _div255(a[1] * u + b[1] * t),
+            _div255(a[2] * u + b[2] * t))
+
+@micropython.viper
+def scale_buffer(buf, count: int, level: int):
+    '''
+    Scale the first count bytes of the buffer in place by level, 0-255.
+    '''
+    p = ptr8(buf)
+    for i in range(count):
+        x = p[i] * level
+        p[i] = (x + 1 + (x >> 8)) >> 8
+
+@micropython.viper
+def blend_buffer(dst, src, count: int, t: int):
+    '''
+    Blend the first count bytes of src into dst in place, from all dst at
+    t=0 to all src at t=255.
+    '''
+    d = ptr8(dst)
+    s = ptr8(src)
+    u = 255 - t
+    for i in range(count):
+        x = d[i] * u + s[i] * t
+        d[i] = (x + 1 + (x >> 8)) >> 8
+
+@micropython.viper
+def hue_fill(buf, count: int, hue16: int, step16: int, v: int):
+    '''
+    Fill count RGB pixels of the buffer with a rainbow at value v, starting
+    at hue16 and advancing step16 per pixel, both in 1/256ths of a hue
+    (i.e., 8.8 fixed point).
+    '''
+    p = ptr8(buf)
+    w = ptr8(WHEEL)
+    h = hue16
+    for i in range(count):
+        j = ((h >> 8) & 0xFF) * 3
+        k = i * 3
+        for c in range(3):
+            x = w[j + c] * v
+            p[k + c] = (x + 1 + (x >> 8)) >> 8
+        h += step16
+
+#EOF
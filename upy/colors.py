@@ -1,35 +1,55 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2024-08-14
-# modified: 2026-02-08
+# modified: 2026-10-19
 
 class Color:
+    '''
+    A named color. Colors are registered on creation, each given an index
+    into the registry; its name is entered in a dict of names to indices for
+    constant time lookup by Color.get(). Color.table() returns the RGB values
+    of all colors as a bytearray indexed by 3 * index, so that palettes can be
+    held as compact arrays of color indices rather than lists of Colors.
+    '''
     _registry = []
+    _names    = []
+    _by_name  = {} # normalized name to index
+    _table    = bytearray()
 
     def __init__(self, name, rgb):
-        self._name = name
+        self._index = len(Color._registry)
+        self._rgb   = rgb # the tuple as given, so that rgb doesn't allocate
         # normalize stored name: strip leading "COLOR_" and lowercase
-        self._norm = name.lower().replace("color_", "").replace("_", " ")
-        self._rgb = rgb
+        _norm = name.lower().replace("color_", "").replace("_", " ")
         Color._registry.append(self)
+        Color._names.append(_norm)
+        Color._by_name[_norm] = self._index
+        Color._table.extend(bytes(rgb))
 
     @property
     def name(self):
         '''
         Return the normalised, lowercase color name.
         '''
-        return self._norm
+        return Color._names[self._index]
 
     @property
     def rgb(self):
         return self._rgb
 
+    @property
+    def index(self):
+        '''
+        Return the index of this color in the registry and RGB table.
+        '''
+        return self._index
+
     def __getitem__(self, index):
         return self._rgb[index]
 
@@ -48,23 +68,42 @@ class Color:
         return hash(self._rgb)
 
     def __repr__(self):
-        return '{} {}'.format(self._name, self._rgb)
+        return '{} {}'.format(self.name, self._rgb)
 
     @classmethod
     def all_colors(cls):
         return cls._registry
 
+    @classmethod
+    def at(cls, index):
+        '''
+        Return the Color with the registry index.
+        '''
+        return cls._registry[index]
+
+    @classmethod
+    def table(cls):
+        '''
+        Return the RGB table, three bytes per color in registry order.
+        '''
+        return cls._table
+
+    @classmethod
+    def palette(cls, colors):
+        '''
+        Return a palette of the colors as a bytes of their indices.
+        '''
+        return bytes(c._index for c in colors)
+
     @classmethod
     def get(cls, name: str):
         '''
         Return a Color whose name matches the key.
         '''
-        key = name.lower().replace("_", " ")
-        for c in cls._registry:
-            norm = c._name.lower().replace("color_", "").replace("_", " ")
-            if norm == key:
-                return c
-        return None
+        index = cls._by_name.get(name)
+        if index is None:
+            index = cls._by_name.get(name.lower().replace("_", " "))
+        return None if index is None else cls._registry[index]
 
 COLOR_BLACK         = Color("COLOR_BLACK",        (  0,   0,   0))
 COLOR_WHITE         = Color("COLOR_WHITE",        (255, 255, 255))
@@ -0,0 +1,289 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Renders stacked effect layers into a single NeoPixel frame at a fixed rate.
+
+import time
+import random
+
+import color_math
+
+# blend modes
+NORMAL   = 'normal'   # mix over the layers below by opacity
+ADD      = 'add'      # add to the layers below, saturating
+MAX      = 'max'      # the brighter of this and the layers below
+MULTIPLY = 'multiply' # scale the layers below
+BLEND_MODES = (NORMAL, ADD, MAX, MULTIPLY)
+
+class Layer:
+    '''
+    A layer of effects, blended onto the frame beneath it.
+
+    The effects may be a single effect object called with each pixel index
+    and returning an RGB tuple (or None to leave the pixel untouched), or a
+    list of per-pixel effects following the picofx conventions: each item
+    is None, a callable, or a tuple of an Updateable and/or callable followed
+    by its arguments. A callable may return an RGB tuple or a brightness
+    from 0.0 to 1.0, displayed as grey. Any item with a tick() method is
+    advanced by the compositor each frame.
+
+    Args:
+        name:       the layer name
+        effects:    the effect, or list of per-pixel effects
+        mode:       the blend mode (default 'normal')
+        opacity:    the layer opacity from 0 to 255 (default 255)
+    '''
+    def __init__(self, name, effects, mode=NORMAL, opacity=255):
+        if mode not in BLEND_MODES:
+            raise ValueError("unrecognised blend mode: '{}'".format(mode))
+        self.name        = name
+        self.mode        = mode
+        self.opacity     = max(0, min(255, opacity))
+        self.updateables = []
+        if isinstance(effects, list):
+            self._field = None
+            self._fns   = [None] * len(effects)
+            self._data  = [()] * len(effects)
+            for i, item in enumerate(effects):
+                if item is None:
+                    continue
+                elif isinstance(item, tuple):
+                    first, rest = item[0], item[1:]
+                    self._add_updateable(first)
+                    if rest and callable(rest[0]):
+                        # the first element is the parent class, then the effect function
+                        self._fns[i]  = rest[0]
+                        self._data[i] = tuple(rest[1:])
+                    else:
+                        self._fns[i]  = first
+                        self._data[i] = tuple(rest)
+                else:
+                    self._add_updateable(item)
+                    self._fns[i] = item
+        else:
+            self._field = effects
+            self._add_updateable(effects)
+
+    def _add_updateable(self, item):
+        if hasattr(item, 'tick') and item not in self.updateables:
+            self.updateables.append(item)
+
+    def render(self, frame, count):
+        '''
+        Blend this layer onto the first count pixels of the RGB frame.
+        '''
+        _mode    = self.mode
+        _alpha   = self.opacity
+        _field   = self._field
+        for i in range(count):
+            if _field is not None:
+                value = _field(i)
+            elif i < len(self._fns) and self._fns[i] is not None:
+                value = self._fns[i](*self._data[i])
+            else:
+                continue
+            if value is None:
+                continue
+            if not isinstance(value, tuple):
+                grey = int(value * 255)
+                value = (grey, grey, grey)
+            j = i * 3
+            for k in range(3):
+                src = (value[k] * _alpha) >> 8 if _alpha < 255 else value[k]
+                dst = frame[j + k]
+                if _mode == NORMAL:
+                    frame[j + k] = src + ((dst * (255 - _alpha)) >> 8)
+                elif _mode == ADD:
+                    frame[j + k] = min(255, dst + src)
+                elif _mode == MAX:
+                    frame[j + k] = src if src > dst else dst
+                else: # MULTIPLY
+                    frame[j + k] = (dst * (255 - _alpha + src)) >> 8
+
+class Compositor:
+    '''
+    Renders a stack of effect layers into one frame buffer at a fixed frame
+    rate, as a scheduler job, and loads it into a Pixel. Effects advance on
+    elapsed time rather than on frame counts, so a late frame doesn't slow
+    the animation, and the cost per second is bounded by the frame rate
+    regardless of the number of effects.
+
+    Args:
+        scheduler:  the Scheduler used to run the render job
+        pixel:      the Pixel to render into
+        count:      the number of pixels
+        fps:        the frame rate (default 30)
+        base:       an optional function filling the frame before the layers
+                    are blended, otherwise each frame starts black
+    '''
+    def __init__(self, scheduler, pixel, count, fps=30, base=None):
+        self._scheduler = scheduler
+        self._pixel     = pixel
+        self._count     = count
+        self._base      = base
+        self._frame     = bytearray(3 * count)
+        self._layers    = []
+        self._fps       = fps
+        self._last_ms   = 0
+        self._job = scheduler.add('anim', self._render, period_ms=1000 // fps, start=False)
+
+    @property
+    def running(self):
+        return self._job.scheduled
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @property
+    def layers(self):
+        return self._layers
+
+    def set_fps(self, fps):
+        if not (0 < fps <= 100):
+            raise ValueError('fps must be between 1 and 100.')
+        self._fps = fps
+        self._scheduler.set_period(self._job, 1000 // fps)
+
+    def add_layer(self, name, effects, mode=NORMAL, opacity=255):
+        '''
+        Add a layer on top of the stack, replacing any of the same name.
+        Returns the Layer.
+        '''
+        self.remove_layer(name)
+        layer = Layer(name, effects, mode, opacity)
+        self._layers.append(layer)
+        return layer
+
+    def remove_layer(self, name):
+        for layer in self._layers:
+            if layer.name == name:
+                self._layers.remove(layer)
+                return True
+        return False
+
+    def clear(self):
+        self._layers = []
+
+    def start(self):
+        if not self.running:
+            self._last_ms = time.ticks_ms()
+            self._scheduler.schedule(self._job, 0)
+
+    def stop(self):
+        self._scheduler.cancel(self._job)
+
+    def _render(self):
+        _now = time.ticks_ms()
+        _delta_ms = time.ticks_diff(_now, self._last_ms)
+        self._last_ms = _now
+        _frame = self._frame
+        if self._base:
+            self._base(_frame)
+        else:
+            _frame[:] = bytes(len(_frame))
+        for layer in self._layers:
+            for updateable in layer.updateables:
+                updateable.tick(_delta_ms)
+            layer.render(_frame, self._count)
+        self._pixel.load(_frame, 0)
+
+# effects ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+class RainbowWave:
+    '''
+    A rainbow spread around the ring, cycling at speed revolutions per second.
+    The hue is held in 8.8 fixed point, so that slow speeds still advance.
+    '''
+    def __init__(self, count, speed=0.25, val=1.0):
+        self._count  = count
+        self.speed   = speed
+        self.val     = val
+        self._offset = 0   # hue in 1/256ths of a hue step
+
+    @property
+    def val(self):
+        return self._val / 255
+
+    @val.setter
+    def val(self, val):
+        self._val = max(0, min(255, int(val * 255)))
+
+    def tick(self, delta_ms):
+        self._offset = (self._offset + int(delta_ms * self.speed * 65536) // 1000) & 0xFFFF
+
+    def reset(self):
+        self._offset = 0
+
+    def __call__(self, index):
+        return color_math.hsv_to_rgb((self._offset >> 8) + (index << 8) // self._count, 255, self._val)
+
+class Chase:
+    '''
+    A pixel with a fading tail travelling around the ring at speed pixels per second.
+    '''
+    def __init__(self, count, color=(255, 255, 255), speed=12, tail=4):
+        self._count    = count
+        self.color     = color
+        self.speed     = speed
+        self.tail      = max(1, tail)
+        self._position = 0.0
+
+    def tick(self, delta_ms):
+        self._position = (self._position + delta_ms * self.speed / 1000) % self._count
+
+    def reset(self):
+        self._position = 0.0
+
+    def __call__(self, index):
+        distance = (int(self._position) - index) % self._count
+        if distance >= self.tail:
+            return None
+        level = 255 - (distance * 255) // self.tail
+        r, g, b = self.color
+        return ((r * level) >> 8, (g * level) >> 8, (b * level) >> 8)
+
+class Sparkle:
+    '''
+    Randomly lit pixels, each fading out over decay_ms (0 for none), with
+    about rate new sparkles per second.
+    '''
+    def __init__(self, count, color=(255, 255, 255), rate=8, decay_ms=400):
+        self._count    = count
+        self.color     = color
+        self.rate      = rate
+        self.decay_ms  = decay_ms
+        self._levels   = bytearray(count)
+        self._carry_ms = 0
+
+    def tick(self, delta_ms):
+        _levels = self._levels
+        _decay_ms = self.decay_ms
+        _fade = 255 if _decay_ms <= 0 else min(255, (255 * delta_ms) // _decay_ms) # 0 fades at once
+        for i in range(self._count):
+            _levels[i] = max(0, _levels[i] - _fade)
+        self._carry_ms += delta_ms * self.rate
+        while self._carry_ms >= 1000:
+            self._carry_ms -= 1000
+            _levels[random.randrange(self._count)] = 255
+
+    def reset(self):
+        self._levels[:] = bytes(self._count)
+        self._carry_ms = 0
+
+    def __call__(self, index):
+        level = self._levels[index]
+        if level == 0:
+            return None
+        r, g, b = self.color
+        return ((r * level) >> 8, (g * level) >> 8, (b * level) >> 8)
+
+#EOF
@@ -6,7 +6,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2026-02-12
+# modified: 2026-10-19
 
 import sys
 import time
@@ -14,11 +14,16 @@ import math, random
 from machine import RTC
 
 from colors import*
-from message_util import pack_message
+from message_util import pack_message, unpack_message
+from gc_manager import GcManager
+from jobs import JobManager
+from profiler import Profiler
+from scheduler import Scheduler
 
 class Controller:
     _AUTOSTART_SERVICES = True           # auto-start services after delay
     _AUTOSTART_DELAY_MS = 7000           # delay in milliseconds before auto-start
+    _MAX_AT_DELAY_MS    = 600000         # furthest ahead an "at" command may be queued
     # pre-packed constant responses
     _PACKED_ACK  = pack_message('ACK')   # acknowledge okay
     _PACKED_NACK = pack_message('NACK')  # acknowledge bad command
@@ -38,21 +43,30 @@ class Controller:
         self._family                = config['family']
 #       print('family set to: {}'.format(self._family))
         self._slave                 = None
+        # idle-window garbage collection
+        self._gc_manager            = GcManager(threshold=config.get('gc_threshold'))
+        # soft scheduler for periodic and one-shot jobs
+        self._scheduler             = Scheduler()
+        # per-command and per-job timing statistics
+        self._profiler              = Profiler(enabled=config.get('profile', True))
+        self._scheduler.set_profiler(self._profiler)
+        # slow command handlers run as background jobs
+        self._jobs                  = JobManager(self._scheduler)
         # neopixel support
         self._pixel = self._create_pixel()
         # heartbeat feature
         self._heartbeat_enabled     = False
         self._heartbeat_on_time_ms  = 50
         self._heartbeat_off_time_ms = 2950
-        self._heartbeat_timer       = 0
-        self._heartbeat_state       = False
-        self._stop_at               = None
+        self._heartbeat_job = self._scheduler.add('heartbeat', self._beat,
+                period_ms=self._heartbeat_on_time_ms + self._heartbeat_off_time_ms, start=False)
+        self._beat_off_job  = self._scheduler.add('beat-off', self._led_off, start=False)
+        # turns off the status pixel after a command
         self._pixel_persist         = False
-        # instantiate pixel and timer
-        self._pixel_timer           = None
-        self._pixel_timer_freq_hz   = 50
-        self._create_pixel_timer()
+        self._pixel_off_job = self._scheduler.add('pixel-off', self._pixel_off, start=False)
         self._services_started      = False
+        if Controller._AUTOSTART_SERVICES:
+            self._scheduler.add('services', self._start_services, delay_ms=Controller._AUTOSTART_DELAY_MS)
         print('ready.')
 
     @property
@@ -75,37 +89,53 @@ class Controller:
         _pixel.set_color(0, COLOR_BLACK)
         return _pixel
 
-    def _create_pixel_timer(self):
-        try:
-            from machine import Timer
-
-            self._pixel_timer = Timer(0)
-            self._pixel_timer.init(freq=self._pixel_timer_freq_hz, callback=self._led_off)
-        except Exception as e:
-            sys.print_exception(e)
-
     # public API ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
     @property
     def pixel(self):
         return self._pixel
 
+    @property
+    def scheduler(self):
+        '''
+        The scheduler used for all periodic and deferred work.
+        '''
+        return self._scheduler
+
+    @property
+    def jobs(self):
+        '''
+        The manager for background jobs.
+        '''
+        return self._jobs
+
     def tick(self, delta_ms):
-        if self._heartbeat_enabled:
-            self._heartbeat(delta_ms)
-        if self._stop_at:
-            if time.ticks_diff(time.ticks_ms(), self._stop_at) >= 0:
-                self._stop_at = None
-                if not self._pixel_persist:
-                    self._pixel.set_color(0, COLOR_BLACK)
-        if Controller._AUTOSTART_SERVICES and not self._services_started:
-            if time.ticks_diff(time.ticks_ms(), self._startup_ms) >= Controller._AUTOSTART_DELAY_MS:
-                self._services_started = True
-                self._start_services()
+        '''
+        Run any scheduled jobs that are due, then write any pixel changes.
+        Pixel changes made by commands and jobs are deferred to this point,
+        so that each strip is written at most once per tick.
+        '''
+        if self._profiler.enabled:
+            _start_us = time.ticks_us()
+            self._scheduler.run()
+            self.show()
+            self._profiler.record('tick', time.ticks_diff(time.ticks_us(), _start_us))
+        else:
+            self._scheduler.run()
+            self.show()
+
+    def show(self):
+        '''
+        Write any modified pixels. Subclasses with further strips should
+        extend this.
+        '''
+        self._pixel.show()
 
     def set_slave(self, slave):
         self._slave = slave
         self._slave.add_callback(self._on_command)
+        self._slave.set_gc_manager(self._gc_manager)
+        self._slave.set_profiler(self._profiler)
 
     def pre_process(self, cmd, arg0, arg1, arg2, arg3, arg4):
         '''
@@ -141,7 +171,14 @@ Commands:
     heartbeat on | off                      # control heartbeat flash
     ping                                    # returns "PING"
     data                                    # return sample data
-    reset                                   # force hardware reset''')
+    gc [ collect | reset | threshold <n> ]  # garbage collection statistics
+    mem                                     # return free/allocated memory
+    prof [ <key> | reset | on | off ]       # command and job timing statistics
+    job <n>                                 # return state and result of job n
+    at <ticks> | +<ms> <command>            # queue command to run at device time
+    @<hex ticks> | @+<hex ms> <command>     # compact form of "at"
+    clock                                   # return device time (ticks_ms)
+    reset                                   # force hardware reset (as a job)''')
 
     def process(self, cmd):
         '''
@@ -150,9 +187,12 @@ Commands:
 
         See get_help() for list of available commands.
         '''
+        _start_us = time.ticks_us()
+        _arg0 = None
+        _profile_key = None
         _show_state = True
         if _show_state:
-            self._stop_at = time.ticks_add(time.ticks_ms(), 1000)  # stop 1 second later
+            self._scheduler.schedule(self._pixel_off_job, 1000)  # stop 1 second later
         _exit_color = COLOR_BLACK # default
 #       self._pixel.set_color(0, COLOR_CYAN)
         try:
@@ -162,6 +202,8 @@ Commands:
                 _exit_color = COLOR_RED
                 return Controller._PACKED_ERR
             _arg0 = parts[0]
+            # "@<ticks>" commands carry a different time each, so share the 'at' key
+            _profile_key = 'at' if _arg0[0] == '@' else _arg0
             _arg1 = parts[1] if len(parts) > 1 else None
             _arg2 = parts[2] if len(parts) > 2 else None
             _arg3 = parts[3] if len(parts) > 3 else None
@@ -207,7 +249,7 @@ Commands:
                         print("ERROR: could not find color: arg1: '{}'; arg2: '{}'".format(_arg1, _arg2))
                         _exit_color = COLOR_RED
                         return Controller._PACKED_ERR
-                    self._pixel.set_color(0, color)
+                    self._pixel.set(0, color)
                     return Controller._PACKED_ACK
                 else:
                     print('ERROR: no pixel available.')
@@ -258,7 +300,7 @@ Commands:
                     green = int(_arg2)
                     blue  = int(_arg3)
                 print("rgb: index: {}; red: '{}'; green: '{}'; blue: '{}'".format(index, red, green, blue))
-                self._pixel.set_color(index, (red, green, blue))
+                self._pixel.set(index, (red, green, blue))
                 return Controller._PACKED_ACK
 
             elif _arg0 == "ping":
@@ -271,12 +313,68 @@ Commands:
                 _message, _exit_color = self._get_data()
                 return pack_message(_message)
 
-            elif _arg0 == "reset":
-                import machine
+            elif _arg0 == "gc":
+                if _arg1 == 'collect':
+                    self._gc_manager.collect()
+                elif _arg1 == 'reset':
+                    self._gc_manager.reset()
+                elif _arg1 == 'threshold':
+                    self._gc_manager.set_threshold(int(_arg2))
+                elif _arg1 is not None:
+                    print("ERROR: unrecognised gc argument: '{}'".format(_arg1))
+                    _exit_color = COLOR_RED
+                    return Controller._PACKED_ERR
+                _exit_color = COLOR_DARK_GREEN
+                return pack_message(self._gc_manager.stats())
 
-                print('performing microcontroller reset…')
-                machine.reset()
-                return Controller._PACKED_ACK
+            elif _arg0 == "mem":
+                _exit_color = COLOR_DARK_GREEN
+                return pack_message(self._gc_manager.mem())
+
+            elif _arg0 == "prof":
+                _exit_color = COLOR_DARK_GREEN
+                if _arg1 is None:
+                    return pack_message(self._profiler.overview())
+                elif _arg1 == 'reset':
+                    self._profiler.reset()
+                    return Controller._PACKED_ACK
+                elif _arg1 == 'on' or _arg1 == 'off':
+                    self._profiler.enable(_arg1 == 'on')
+                    return Controller._PACKED_ACK
+                _summary = self._profiler.summary(_arg1)
+                if _summary is None:
+                    print("ERROR: no profile for '{}'".format(_arg1))
+                    _exit_color = COLOR_RED
+                    return Controller._PACKED_ERR
+                return pack_message(_summary)
+
+            elif _arg0 == "job":
+                _status = self._jobs.status(int(_arg1))
+                if _status is None:
+                    print("ERROR: unknown job: '{}'".format(_arg1))
+                    _exit_color = COLOR_RED
+                    return Controller._PACKED_ERR
+                _exit_color = COLOR_DARK_GREEN
+                return pack_message(_status)
+
+            elif _arg0 == "at" or _arg0.startswith('@'):
+                # e.g., "at 1234567 ring all red", "at +500 rotate on" or "@12d687 ring all red"
+                if _arg0 == "at":
+                    _delay_ms = self._get_delay_ms(_arg1, 10)
+                    _deferred = cmd.split(None, 2)[2]
+                else:
+                    _delay_ms = self._get_delay_ms(_arg0[1:], 16)
+                    _deferred = cmd.split(None, 1)[1]
+                _exit_color = COLOR_DARK_GREEN
+                return self._accept(self._process_deferred, (_deferred,), delay_ms=_delay_ms)
+
+            elif _arg0 == "clock":
+                _exit_color = COLOR_DARK_GREEN
+                return pack_message(str(time.ticks_ms()))
+
+            elif _arg0 == "reset":
+                # delayed so that the master can read the response first
+                return self._accept(self._reset, delay_ms=200)
 
             else:
                 # post-process
@@ -292,7 +390,10 @@ Commands:
                             "; arg2: '{}'".format(_arg2) if _arg2 else '',
                             "; arg3: '{}'".format(_arg3) if _arg3 else '',
                             "; arg2: '{}'".format(_arg4) if _arg4 else ''))
-                    return Controller._PACKED_NACK, COLOR_ORANGE
+                    # unrecognised verbs share a key, so as not to grow the profiler
+                    _profile_key = Profiler.OTHER
+                    _exit_color = COLOR_ORANGE
+                    return Controller._PACKED_NACK
 
         except Exception as e:
             print("ERROR: {} raised by controller: {}".format(type(e), e))
@@ -301,7 +402,9 @@ Commands:
             return Controller._PACKED_ERR
         finally:
             if _show_state:
-                self._pixel.set_color(0, _exit_color)
+                self._pixel.set(0, _exit_color)
+            if _profile_key:
+                self._profiler.record(_profile_key, time.ticks_diff(time.ticks_us(), _start_us))
 
     # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
@@ -316,6 +419,39 @@ Commands:
         _exit_color = COLOR_FUCHSIA
         return _data, _exit_color
 
+    def _accept(self, fn, args=(), delay_ms=0):
+        '''
+        Submit fn(*args) as a background job, returning the packed response
+        'JOB <n>'. The job's completion may be queried with "job <n>".
+        '''
+        return pack_message('JOB {}'.format(self._jobs.submit(fn, args, delay_ms)))
+
+    def _get_delay_ms(self, when, base):
+        '''
+        Return the delay until the device time given by 'when', either an
+        absolute ticks_ms value or '+' followed by milliseconds from now.
+        A time already past returns zero.
+        '''
+        if when.startswith('+'):
+            _delay_ms = int(when[1:], base)
+        else:
+            _delay_ms = time.ticks_diff(int(when, base), time.ticks_ms())
+        if _delay_ms > Controller._MAX_AT_DELAY_MS:
+            raise ValueError('time is more than {}ms ahead.'.format(Controller._MAX_AT_DELAY_MS))
+        return max(0, _delay_ms)
+
+    def _process_deferred(self, cmd):
+        '''
+        Process a command queued by "at", returning its response as the job result.
+        '''
+        return unpack_message(self.process(cmd))
+
+    def _reset(self):
+        import machine
+
+        print('performing microcontroller reset…')
+        machine.reset()
+
     def _on_command(self, cmd):
         '''
         The callback from the I2C slave, passes the command on for processing,
@@ -323,51 +459,39 @@ Commands:
         '''
         return self.process(cmd)
 
-    def _led_off(self, timer=None):
+    def _led_off(self):
         if self._pixel:
-            self._pixel.set_color(0, COLOR_BLACK)
+            self._pixel.set(0, COLOR_BLACK)
+
+    def _pixel_off(self):
+        if not self._pixel_persist:
+            self._led_off()
 
     def _start_services(self):
-        time_elapsed = time.ticks_ms() - self._startup_ms
+        self._services_started = True
+        time_elapsed = time.ticks_diff(time.ticks_ms(), self._startup_ms)
         print('starting services after {}ms'.format(time_elapsed))
         self._enable_heartbeat(True)
         pass # whatever services to be started after a delay
 
     def _enable_heartbeat(self, enabled):
         self._heartbeat_enabled = enabled
-        if not enabled:
-            self._pixel_timer.deinit()
+        if enabled:
+            if not self._heartbeat_job.scheduled:
+                self._scheduler.schedule(self._heartbeat_job, self._heartbeat_off_time_ms)
+        else:
+            self._scheduler.cancel(self._heartbeat_job)
+            self._scheduler.cancel(self._beat_off_job)
 
     def _beat(self):
-        self._pixel.set_color(0, COLOR_DARK_CYAN)
-        if self._pixel_timer:
-            self._pixel_timer.deinit()
-#           self._pixel_timer.init(freq=self._pixel_timer_freq_hz)
-            self._pixel_timer.init(freq=self._pixel_timer_freq_hz, callback=self._led_off)
-
-    def _heartbeat(self, delta_ms):
-        self._heartbeat_timer += delta_ms
-        if self._heartbeat_state:
-            if self._heartbeat_timer >= self._heartbeat_on_time_ms:
-                self._heartbeat_state = False
-                self._heartbeat_timer = 0
-        else:
-            if self._heartbeat_timer >= self._heartbeat_off_time_ms:
-                self._heartbeat_state = True
-                self._beat()
-                self._heartbeat_timer = 0
+        self._pixel.set(0, COLOR_DARK_CYAN)
+        self._scheduler.schedule(self._beat_off_job, self._heartbeat_on_time_ms)
 
     def _get_color(self, name, second_token):
         if second_token: # e.g., "dark cyan"
             name = '{} {}'.format(name, second_token)
         return Color.get(name)
 
-    def _set_rotation_pending(self, t):
-        self._rotation_pending = True
-
-    def _action(self, t):
-        pass
-
     def _parse_timestamp(self, ts):
         year    = int(ts[0:4])
         month   = int(ts[4:6])
@@ -0,0 +1,136 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Schedules garbage collection into the idle window following a response.
+
+import gc
+import time
+
+class GcManager:
+    DEFAULT_THRESHOLD = 32768 # bytes allocated before gc.threshold() forces a collection
+    '''
+    Keeps garbage collection out of the command critical path. The I2C slave
+    calls response_written() once a response is in its memory buffer, which
+    opens an idle window: the master is now reading or sleeping and won't
+    write again for some time. poll() then collects within that window if
+    at least half the threshold has been allocated since the last collection.
+    The threshold itself is set via gc.threshold() as a backstop, so that any
+    collection the runtime forces on its own is rare; these are counted as
+    'auto' collections.
+
+    Args:
+        threshold:  the allocation threshold in bytes (default 32768)
+    '''
+    def __init__(self, threshold=None):
+        self._threshold   = 0
+        self._soft_limit  = 0
+        self._window_open = False
+        self.set_threshold(threshold if threshold else GcManager.DEFAULT_THRESHOLD)
+        self.reset()
+
+    @property
+    def threshold(self):
+        return self._threshold
+
+    @property
+    def interval_ms(self):
+        '''
+        The time between the last two idle collections in milliseconds, zero
+        until two have occurred since the last reset. stats() reports the
+        mean, as the reply has no room for both.
+        '''
+        return self._interval_ms
+
+    def set_threshold(self, threshold):
+        '''
+        Set the allocation threshold in bytes. Idle collections occur after
+        half this amount has been allocated.
+        '''
+        if threshold < 1024:
+            raise ValueError('threshold must be at least 1024 bytes.')
+        self._threshold  = threshold
+        self._soft_limit = threshold // 2
+        gc.threshold(threshold)
+
+    def reset(self):
+        '''
+        Reset the collection statistics.
+        '''
+        self._count        = 0   # idle collections
+        self._auto_count   = 0   # collections forced by the runtime
+        self._last_us      = 0
+        self._max_us       = 0
+        self._total_us     = 0
+        self._reset_ts     = time.ticks_ms()
+        self._last_gc_ts   = self._reset_ts
+        self._interval_ms  = 0   # time between the last two collections
+        self._baseline     = gc.mem_alloc()
+        self._last_alloc   = self._baseline
+
+    def response_written(self):
+        '''
+        Called by the I2C slave once a response has been written.
+        '''
+        self._window_open = True
+
+    def poll(self):
+        '''
+        Called when no command is pending. Collects only if an idle window is
+        open and the soft limit has been reached.
+        '''
+        _alloc = gc.mem_alloc()
+        if _alloc < self._last_alloc:
+            # memory went down without us: the runtime collected
+            self._auto_count += 1
+            self._baseline = _alloc
+        self._last_alloc = _alloc
+        if self._window_open:
+            self._window_open = False
+            if _alloc - self._baseline >= self._soft_limit:
+                self.collect()
+
+    def collect(self):
+        '''
+        Collect immediately, recording the pause time.
+        '''
+        _start = time.ticks_us()
+        gc.collect()
+        _elapsed_us = time.ticks_diff(time.ticks_us(), _start)
+        _now = time.ticks_ms()
+        self._count      += 1
+        self._last_us     = _elapsed_us
+        self._total_us   += _elapsed_us
+        if _elapsed_us > self._max_us:
+            self._max_us = _elapsed_us
+        if self._count > 1:
+            self._interval_ms = time.ticks_diff(_now, self._last_gc_ts)
+        self._last_gc_ts  = _now
+        self._baseline    = gc.mem_alloc()
+        self._last_alloc  = self._baseline
+
+    def stats(self):
+        '''
+        Return the collection statistics as a compact string: collection
+        count, auto count, last/max/mean pause (µs), mean interval (ms).
+        '''
+        _mean_us = self._total_us // self._count if self._count else 0
+        _mean_interval_ms = (time.ticks_diff(self._last_gc_ts, self._reset_ts) // self._count
+                if self._count else 0)
+        return 'n:{} a:{} last:{} max:{} avg:{} int:{}'.format(
+                self._count, self._auto_count, self._last_us, self._max_us, _mean_us, _mean_interval_ms)
+
+    def mem(self):
+        '''
+        Return heap usage as a compact string.
+        '''
+        return 'free:{} alloc:{} thr:{}'.format(gc.mem_free(), gc.mem_alloc(), self._threshold)
+
+#EOF
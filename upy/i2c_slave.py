@@ -7,7 +7,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2026-02-07
+# modified: 2026-10-19
 #
 # I2C slave using single memory buffer for ESP32-S3.
 
@@ -38,6 +38,8 @@ class I2CSlave:
         self._mem_buf = bytearray(I2CSlave.MEM_LENGTH)
         self._rx_copy = bytearray(I2CSlave.MEM_LENGTH)
         self._callback = None
+        self._gc_manager = None
+        self._profiler = None
         self._new_cmd = False
         self._processing = False
         # initialize with ACK
@@ -64,6 +66,20 @@ class I2CSlave:
     def add_callback(self, callback):
         self._callback = callback
 
+    def set_gc_manager(self, gc_manager):
+        '''
+        Set the GcManager notified after each response is written, and polled
+        while the slave is idle.
+        '''
+        self._gc_manager = gc_manager
+
+    def set_profiler(self, profiler):
+        '''
+        Set the Profiler used to time command handling: 'i2c' from the start
+        of processing to the response being written, 'tx' for the write alone.
+        '''
+        self._profiler = profiler
+
     def _irq_handler(self, i2c):
         '''
         The IRQ handler used on the ESP32 and RP2.
@@ -78,6 +94,7 @@ class I2CSlave:
 
     def check_and_process(self):
         if self._new_cmd and not self._processing:
+            _start_us = time.ticks_us()
             self._new_cmd = False
             self._processing = True
             msg_len = self._rx_copy[0]
@@ -93,6 +110,7 @@ class I2CSlave:
             except Exception as e:
                 print("ERROR: {} raised: {} [1]".format(type(e), e))
                 resp_bytes = I2CSlave.PACKED_ERR
+            _tx_us = time.ticks_us()
             try: 
                 for i in range(len(resp_bytes)):
                     self._mem_buf[i] = resp_bytes[i]
@@ -102,5 +120,13 @@ class I2CSlave:
                 print("ERROR: {} raised: {} [2]".format(type(e), e))
             finally:
                 self._processing = False
+                if self._profiler:
+                    _end_us = time.ticks_us()
+                    self._profiler.record('tx', time.ticks_diff(_end_us, _tx_us))
+                    self._profiler.record('i2c', time.ticks_diff(_end_us, _start_us))
+                if self._gc_manager:
+                    self._gc_manager.response_written()
+        elif self._gc_manager and not self._new_cmd:
+            self._gc_manager.poll()
 
 #EOF
@@ -0,0 +1,106 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Runs slow command handlers as background jobs after the response is written.
+
+import sys
+
+class _Entry:
+    '''
+    A slot in the job table, holding the state of one job.
+    '''
+    def __init__(self, manager):
+        self.id     = 0
+        self.fn     = None
+        self.args   = ()
+        self.state  = JobManager.EMPTY
+        self.result = None
+        self.job    = manager.scheduler.add('job', lambda: manager._run(self), start=False)
+
+class JobManager:
+    MAX_JOBS = 16   # size of the job table
+    MAX_ID   = 999  # job ids wrap back to 1 after this
+    # job states
+    EMPTY    = 'empty'
+    QUEUED   = 'queued'
+    DONE     = 'done'
+    FAILED   = 'error'
+    '''
+    Accepts slow work from command handlers, returning a job id immediately
+    so that the response can be written without waiting for the work to be
+    done. Each job runs as a one-shot scheduler job, i.e., from the main loop
+    after the response has been written, and its state and result are then
+    available via status() until its slot is reused.
+
+    The job table is fixed in size: slots are reused in turn, skipping any
+    holding a queued job, and a job can only be refused if all slots hold
+    queued jobs.
+
+    Args:
+        scheduler:  the Scheduler used to run jobs
+    '''
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self._next_id  = 1
+        self._next_slot = 0
+        self._entries  = [_Entry(self) for _ in range(JobManager.MAX_JOBS)]
+
+    def submit(self, fn, args=(), delay_ms=0):
+        '''
+        Queue fn(*args) to run after delay_ms, returning the job id.
+        Raises RuntimeError if the job table is full.
+        '''
+        entry = None
+        for i in range(JobManager.MAX_JOBS):
+            slot = (self._next_slot + i) % JobManager.MAX_JOBS
+            if self._entries[slot].state != JobManager.QUEUED:
+                entry = self._entries[slot]
+                self._next_slot = (slot + 1) % JobManager.MAX_JOBS
+                break
+        if entry is None:
+            raise RuntimeError('job table full.')
+        job_id = self._next_id
+        self._next_id = job_id % JobManager.MAX_ID + 1
+        entry.id     = job_id
+        entry.fn     = fn
+        entry.args   = args
+        entry.state  = JobManager.QUEUED
+        entry.result = None
+        self.scheduler.schedule(entry.job, delay_ms)
+        return job_id
+
+    def status(self, job_id):
+        '''
+        Return the state of the job as 'JOB <n> <state>', followed by its
+        result if it returned one, or None if the job is unknown.
+        '''
+        for entry in self._entries:
+            if entry.id == job_id and entry.state != JobManager.EMPTY:
+                if entry.result is None:
+                    return 'JOB {} {}'.format(job_id, entry.state)
+                return 'JOB {} {} {}'.format(job_id, entry.state, entry.result)[:62]
+        return None
+
+    def _run(self, entry):
+        try:
+            result = entry.fn(*entry.args)
+            entry.result = None if result is None else str(result)
+            entry.state  = JobManager.DONE
+        except Exception as e:
+            print("ERROR: {} raised by job {}: {}".format(type(e), entry.id, e))
+            sys.print_exception(e)
+            entry.result = type(e).__name__
+            entry.state  = JobManager.FAILED
+        finally:
+            entry.fn   = None
+            entry.args = ()
+
+#EOF
@@ -7,7 +7,7 @@
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2026-02-15
+# modified: 2026-10-19
 
 import sys
 import micropython
@@ -86,4 +86,8 @@ def unpack_message(msg_bytes):
         raise ValueError('crc8 mismatch')
     return payload_bytes.decode('ascii')
 
+# symbols encoding the values 0-63 in frame upload commands, one per character;
+# none are altered by lowercasing or are whitespace
+FRAME_SYMBOLS = '0123456789abcdefghijklmnopqrstuvwxyz!#$%&()*+,-./:;<=>?@[]^_{|}~'
+
 #EOF
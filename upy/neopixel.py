@@ -1,8 +1,23 @@
 # NeoPixel driver for MicroPython
 # MIT license; Copyright (c) 2016 Damien P. George, 2021 Jim Mussared
 
+import micropython
 from machine import bitstream
 
+@micropython.viper
+def _load3(buf: ptr8, start: int, src: ptr8, count: int, lut: ptr8, o0: int, o1: int, o2: int):
+    # copy count RGB triples from src into buf at byte start, through the
+    # lookup table and into the color order given by o0, o1, o2
+    i = 0
+    j = start
+    end = count * 3
+    while i < end:
+        buf[j + o0] = lut[src[i]]
+        buf[j + o1] = lut[src[i + 1]]
+        buf[j + o2] = lut[src[i + 2]]
+        i += 3
+        j += 3
+
 class NeoPixel:
     ORDER_MAP = {
         "RGB": (0, 1, 2),
@@ -15,12 +30,16 @@ class NeoPixel:
 
     ORDER = (0, 1, 2)
 
-    def __init__(self, pin, n, bpp=3, timing=1, color_order="RGB", brightness=1.0):
+    def __init__(self, pin, n, bpp=3, timing=1, color_order="RGB", brightness=1.0, gamma=1.0):
         self.pin = pin
         self.n = n
         self.bpp = bpp
         self.buf = bytearray(n * bpp)
+        self._scratch = None # buffer swapped with buf on rotate
         self.pin.init(pin.OUT)
+        # brightness x gamma lookup table, rebuilt when either changes
+        self._lut = bytearray(256)
+        self._gamma = gamma
         self.brightness = brightness
         # Timing arg can either be 1 for 800kHz or 0 for 400kHz,
         # or a user-specified timing ns tuple (high_0, low_0, high_1, low_1).
@@ -37,10 +56,57 @@ class NeoPixel:
     def __len__(self):
         return self.n
 
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, brightness):
+        self._brightness = brightness
+        self._build_lut()
+
+    @property
+    def gamma(self):
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, gamma):
+        self._gamma = gamma
+        self._build_lut()
+
+    def _build_lut(self):
+        lut = self._lut
+        b = self._brightness * 255
+        g = self._gamma
+        for i in range(256):
+            lut[i] = int(b * (i / 255) ** g)
+
     def __setitem__(self, i, v):
+        # channel values are clamped to 0-255, as a negative one would
+        # otherwise index the LUT from the end
         offset = i * self.bpp
+        lut = self._lut
         for i in range(self.bpp):
-            self.buf[offset + self.ORDER[i]] = int(v[i] * self.brightness)
+            self.buf[offset + self.ORDER[i]] = lut[min(255, max(0, v[i]))]
+
+    def set_rgb(self, i, r, g, b):
+        # write a single RGB pixel without a tuple (bpp 3 only)
+        buf = self.buf
+        lut = self._lut
+        order = self.ORDER
+        offset = i * 3
+        buf[offset + order[0]] = lut[min(255, max(0, r))]
+        buf[offset + order[1]] = lut[min(255, max(0, g))]
+        buf[offset + order[2]] = lut[min(255, max(0, b))]
+
+    def load(self, src, offset=0):
+        # write consecutive RGB triples from the bytes-like src into the
+        # frame starting at pixel offset (bpp 3 only), returning the count
+        count = min(len(src) // 3, self.n - offset)
+        if count > 0:
+            order = self.ORDER
+            _load3(self.buf, offset * 3, src, count, self._lut, order[0], order[1], order[2])
+        return max(0, count)
 
     def __getitem__(self, i):
         offset = i * self.bpp
@@ -51,12 +117,30 @@ class NeoPixel:
         l = len(self.buf)
         bpp = self.bpp
         for i in range(bpp):
-            c = int(v[i] * self.brightness)
+            c = self._lut[v[i]]
             j = self.ORDER[i]
             while j < l:
                 b[j] = c
                 j += bpp
 
+    def rotate(self, shift):
+        # Rotate the pixels by shift positions toward higher indices (negative
+        # toward lower), as two slice copies into a scratch buffer which then
+        # becomes the frame buffer.
+        n = self.n
+        shift %= n
+        if shift == 0:
+            return
+        if self._scratch is None:
+            self._scratch = bytearray(len(self.buf))
+        k = shift * self.bpp
+        l = len(self.buf)
+        src = memoryview(self.buf)
+        dst = memoryview(self._scratch)
+        dst[k:] = src[:l - k]
+        dst[:k] = src[l - k:]
+        self.buf, self._scratch = self._scratch, self.buf
+
     def write(self):
         # BITSTREAM_TYPE_HIGH_LOW = 0
         bitstream(self.pin, 0, self.timing, self.buf)
@@ -7,15 +7,21 @@
 #
 # author:   Ichiro Furusato
 # created:  2025-05-23
-# modified: 2025-02-01
+# modified: 2026-10-19
 
 import time
 from machine import Pin
 from neopixel import NeoPixel
 from colors import Color
+import color_math
 
 class Pixel:
-    def __init__(self, pin=None, pixel_count=1, color_order='GRB', brightness=0.33):
+    '''
+    Wraps a NeoPixel strip. set_color() writes to the strip immediately; for
+    updates of several pixels, set() and fill() only modify the frame buffer
+    and mark it dirty, and show() then writes the frame once.
+    '''
+    def __init__(self, pin=None, pixel_count=1, color_order='GRB', brightness=0.33, gamma=1.0):
         if pin is None:
             raise ValueError('pin must be specified.')
         elif isinstance(pin, Pin):
@@ -28,7 +34,8 @@ class Pixel:
         self._pixel_count = pixel_count
         self._pixel_index = 0
         self._brightness = brightness
-        self._neopixel = NeoPixel(_pin, pixel_count, color_order=color_order, brightness=brightness)
+        self._dirty = False
+        self._neopixel = NeoPixel(_pin, pixel_count, color_order=color_order, brightness=brightness, gamma=gamma)
         self.set_color(index=None, color=None)
 #       print('neopixel ready on pin {}.'.format(pin))
 
@@ -40,6 +47,20 @@ class Pixel:
     def brightness(self):
         return self._brightness
 
+    def set_brightness(self, brightness):
+        '''
+        Set the brightness (0.0-1.0) applied to subsequently set pixels.
+        '''
+        self._brightness = brightness
+        self._neopixel.brightness = brightness
+
+    def set_gamma(self, gamma):
+        '''
+        Set the gamma correction applied to subsequently set pixels, where
+        1.0 is none and around 2.5 gives perceptually linear fades.
+        '''
+        self._neopixel.gamma = gamma
+
     def rainbow_cycle(self, delay=0.05, steps=-1):
         step = 0
         while True:
@@ -52,7 +73,17 @@ class Pixel:
             if steps != -1 and step >= steps:
                 break
 
-    def set_color(self, index=None, color=None):
+    @property
+    def dirty(self):
+        '''
+        True if the frame has been modified since it was last written.
+        '''
+        return self._dirty
+
+    def set(self, index=None, color=None):
+        '''
+        Set the color of the pixel in the frame without writing it to the strip.
+        '''
         _index = self._pixel_index if index is None else index
         if isinstance(color, Color):
             self._neopixel[_index] = color.rgb
@@ -60,34 +91,75 @@ class Pixel:
             self._neopixel[_index] = (0, 0, 0)
         else:
             self._neopixel[_index] = color
-        self._neopixel.write()
+        self._dirty = True
+
+    def set_rgb(self, index, red, green, blue):
+        '''
+        Set the color of the pixel in the frame from its channels, without
+        writing it to the strip.
+        '''
+        self._neopixel.set_rgb(index, red, green, blue)
+        self._dirty = True
+
+    def load(self, src, offset=0):
+        '''
+        Set consecutive pixels in the frame from a bytearray of RGB triples,
+        starting at the offset, without writing it to the strip. Returns the
+        number of pixels set.
+        '''
+        count = self._neopixel.load(src, offset)
+        self._dirty = True
+        return count
+
+    def fill(self, color=None):
+        '''
+        Set all pixels in the frame to the color without writing it to the strip.
+        '''
+        if isinstance(color, Color):
+            self._neopixel.fill(color.rgb)
+        elif color is None:
+            self._neopixel.fill((0, 0, 0))
+        else:
+            self._neopixel.fill(color)
+        self._dirty = True
+
+    def rotate(self, shift=1):
+        '''
+        Rotate the frame by shift pixels toward higher indices (negative
+        toward lower) without writing it to the strip.
+        '''
+        self._neopixel.rotate(shift)
+        self._dirty = True
+
+    def show(self):
+        '''
+        Write the frame to the strip if it has been modified, returning True
+        if written.
+        '''
+        if self._dirty:
+            self._dirty = False
+            self._neopixel.write()
+            return True
+        return False
+
+    def set_color(self, index=None, color=None):
+        '''
+        Set the color of the pixel and write the frame immediately.
+        '''
+        self.set(index, color)
+        self.show()
 
     def off(self):
-        for i in range(self._pixel_count):
-            self._neopixel[i] = (0, 0, 0)
-        self._neopixel.write()
+        self.fill(None)
+        self.show()
 
     @staticmethod
     def hsv_to_rgb(h, s=1.0, v=1.0):
-        i = int(h * 6)
-        f = (h * 6) - i
-        p = int(v * (1 - s) * 255)
-        q = int(v * (1 - f * s) * 255)
-        t = int(v * (1 - (1 - f) * s) * 255)
-        v = int(v * 255)
-        i %= 6
-        if i == 0:
-            return (v, t, p)
-        elif i == 1:
-            return (q, v, p)
-        elif i == 2:
-            return (p, v, t)
-        elif i == 3:
-            return (p, q, v)
-        elif i == 4:
-            return (t, p, v)
-        else:
-            return (v, p, q)
+        '''
+        Return the RGB tuple of the hue, saturation and value, each 0.0-1.0.
+        See color_math.hsv_to_rgb() for the integer version.
+        '''
+        return color_math.hsv_to_rgb(int(h * 256) & 0xFF, int(s * 255), int(v * 255))
 
     @staticmethod
     def rgb_to_hsv(r, g, b):
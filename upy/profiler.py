@@ -0,0 +1,107 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# Lightweight timing statistics for commands and scheduled jobs.
+
+from array import array
+
+# indices into each statistics array
+_COUNT = 0
+_MIN   = 1
+_TOTAL = 2
+_MAX   = 3
+_HIST  = 4
+
+class Profiler:
+    # upper bounds of the histogram buckets in microseconds; the last bucket is open-ended
+    BUCKETS_US = (250, 1000, 4000, 16000)
+    MAX_REPLY  = 62 # the maximum payload of a reply frame
+    MAX_KEYS   = 32 # beyond which times are recorded against OTHER
+    OTHER      = 'other'
+    '''
+    Records elapsed times in microseconds against a key (a command verb, a
+    scheduler job, or a phase of the I2C slave), keeping the count, minimum,
+    mean, maximum and a small histogram for each. Statistics for a key are
+    held in a preallocated array, so recording does not allocate once a key
+    has been seen; once MAX_KEYS keys have been seen, times against any new
+    key are recorded against OTHER, so that the number of arrays is bounded.
+    '''
+    def __init__(self, enabled=True):
+        self._enabled = enabled
+        self._stats   = {}
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self, enabled):
+        self._enabled = enabled
+
+    def reset(self):
+        self._stats = {}
+
+    def record(self, key, elapsed_us):
+        '''
+        Record an elapsed time in microseconds against the key.
+        '''
+        if not self._enabled:
+            return
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= Profiler.MAX_KEYS:
+                key = Profiler.OTHER
+                stats = self._stats.get(key)
+        if stats is None:
+            stats = array('l', [0, 0x7fffffff, 0, 0] + [0] * (len(Profiler.BUCKETS_US) + 1))
+            self._stats[key] = stats
+        stats[_COUNT] += 1
+        stats[_TOTAL] += elapsed_us
+        if elapsed_us < stats[_MIN]:
+            stats[_MIN] = elapsed_us
+        if elapsed_us > stats[_MAX]:
+            stats[_MAX] = elapsed_us
+        bucket = 0
+        for limit in Profiler.BUCKETS_US:
+            if elapsed_us < limit:
+                break
+            bucket += 1
+        stats[_HIST + bucket] += 1
+
+    def summary(self, key):
+        '''
+        Return the statistics for the key as a compact string:
+        count, minimum, mean and maximum (µs), then the histogram counts.
+        Returns None if the key has not been recorded.
+        '''
+        stats = self._stats.get(key)
+        if stats is None:
+            return None
+        count = stats[_COUNT]
+        return '{} n:{} min:{} avg:{} max:{} h:{}'.format(
+                key, count, stats[_MIN], stats[_TOTAL] // count, stats[_MAX],
+                '/'.join(str(h) for h in stats[_HIST:]))[:Profiler.MAX_REPLY]
+
+    def overview(self):
+        '''
+        Return the mean time (µs) of each key, slowest first by maximum, as
+        many as fit within a single reply frame, or 'none' if empty.
+        '''
+        keys = sorted(self._stats, key=lambda k: self._stats[k][_MAX], reverse=True)
+        reply = ''
+        for key in keys:
+            stats = self._stats[key]
+            item = '{}:{}'.format(key, stats[_TOTAL] // stats[_COUNT])
+            if len(reply) + len(item) + 1 > Profiler.MAX_REPLY:
+                break
+            reply = item if not reply else reply + ' ' + item
+        return reply if reply else 'none'
+
+#EOF
@@ -6,21 +6,49 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-02-09
-# modified: 2026-02-17
+# modified: 2026-10-19
 
 import sys
 import time
 import math, random
-from pixel_state import PixelState
+import micropython
+from array import array
 from controller import Controller
+from compositor import Compositor, RainbowWave, Chase, Sparkle, BLEND_MODES
 #from stm32controller import STM32Controller
 from colors import *
 from pixel import Pixel
+from message_util import FRAME_SYMBOLS
+
+# theme pulse brightness for 256 steps of phase, (sin + 1) / 2 scaled to 0-255
+_PULSE = bytes(int((math.sin(i * 2 * math.pi / 256) + 1) * 127.5) for i in range(256))
+
+@micropython.viper
+def _pulse(color: ptr8, base: ptr8, phases: ptr16, active: ptr8, count: int, step: int, table: ptr8):
+    # advance the phase of each active pixel and scale its base color by the
+    # tabulated brightness for that phase
+    i = 0
+    while i < count:
+        if active[i >> 3] & (1 << (i & 7)):
+            phase = (phases[i] + step) & 0xFFFF
+            phases[i] = phase
+            level = table[phase >> 8]
+            j = i * 3
+            color[j]     = (base[j]     * level + 255) >> 8
+            color[j + 1] = (base[j + 1] * level + 255) >> 8
+            color[j + 2] = (base[j + 2] * level + 255) >> 8
+        i += 1
 
 #class RingController(STM32Controller):
 class RingController(Controller):
     '''
-    An implementation connected to a 24 pixel NeoPixel ring.
+    An implementation connected to a NeoPixel ring (or strip) of 'ring_count'
+    pixels.
+
+    The ring model is held as parallel arrays indexed by logical pixel: the
+    base RGB color set by commands, the current RGB color as displayed, a
+    fixed-point pulse phase, and a bitmap of pixels that are active (i.e.,
+    have a base color). Rotation offsets the model onto the physical ring.
     '''
     def __init__(self, config):
         super().__init__(config)
@@ -34,26 +62,33 @@ class RingController(Controller):
         self._ring_offset      = 0
         self._rotate_direction = 1 # 1 or -1
         self._enable_rotate    = False
-        self._rotate_pending   = False # flag for deferred execution
-        self._ring_model = [PixelState() for _ in range(self._ring_count)]
+        self._rotate_hz        = 24
+        # ring model
+        self._base   = bytearray(3 * self._ring_count) # base RGB
+        self._color  = bytearray(3 * self._ring_count) # current RGB
+        self._active = bytearray((self._ring_count + 7) // 8)
         # theme
         self._enable_theme     = False
         self._pulse_steps      = 40
-        self._theme_pending    = False # flag for deferred execution
+        self._phase_step       = 65536 // self._pulse_steps
+        self._phases = array('H', bytes(2 * self._ring_count)) # 16 bit fixed-point, 65536 per cycle
+        self._theme_hz         = 24
         self._theme_target_pixels = 12 # default
-        self._all  = Color.all_colors()
-        self._cool = [ COLOR_BLUE, COLOR_CYAN, COLOR_DARK_BLUE, COLOR_DARK_CYAN,
+        # palettes are held as bytes of color indices
+        self._all  = bytes(range(len(Color.all_colors())))
+        self._lit  = bytes(c.index for c in Color.all_colors() if c != COLOR_BLACK)
+        self._cool = Color.palette([ COLOR_BLUE, COLOR_CYAN, COLOR_DARK_BLUE, COLOR_DARK_CYAN,
                        COLOR_CORNFLOWER, COLOR_INDIGO, COLOR_VIOLET, COLOR_DEEP_CYAN,
-                       COLOR_PURPLE, COLOR_SKY_BLUE ]
-        self._warm = [ COLOR_RED, COLOR_YELLOW, COLOR_DARK_RED, COLOR_DARK_YELLOW,
-                       COLOR_ORANGE, COLOR_TANGERINE, COLOR_PINK, COLOR_FUCHSIA, COLOR_AMBER ]
-        self._wild = [ COLOR_MAGENTA, COLOR_DARK_MAGENTA, COLOR_CORNFLOWER, COLOR_INDIGO, COLOR_RED,
+                       COLOR_PURPLE, COLOR_SKY_BLUE ])
+        self._warm = Color.palette([ COLOR_RED, COLOR_YELLOW, COLOR_DARK_RED, COLOR_DARK_YELLOW,
+                       COLOR_ORANGE, COLOR_TANGERINE, COLOR_PINK, COLOR_FUCHSIA, COLOR_AMBER ])
+        self._wild = Color.palette([ COLOR_MAGENTA, COLOR_DARK_MAGENTA, COLOR_CORNFLOWER, COLOR_INDIGO, COLOR_RED,
                        COLOR_VIOLET, COLOR_PINK, COLOR_FUCHSIA, COLOR_PURPLE, COLOR_SKY_BLUE,
-                       COLOR_WHITE, COLOR_APPLE, COLOR_EMERALD, COLOR_TANGERINE, COLOR_AMBER ]
-        self._grey = [ COLOR_WHITE, COLOR_GREY_0, COLOR_GREY_1, COLOR_GREY_2, COLOR_GREY_3,
-                       COLOR_GREY_4, COLOR_GREY_5, COLOR_GREY_6, COLOR_GREY_7 ]
-        self._dark = [ COLOR_DARK_RED, COLOR_DARK_GREEN, COLOR_DARK_BLUE, COLOR_DARK_CYAN,
-                       COLOR_DARK_MAGENTA, COLOR_DARK_YELLOW, COLOR_PURPLE ]
+                       COLOR_WHITE, COLOR_APPLE, COLOR_EMERALD, COLOR_TANGERINE, COLOR_AMBER ])
+        self._grey = Color.palette([ COLOR_WHITE, COLOR_GREY_0, COLOR_GREY_1, COLOR_GREY_2, COLOR_GREY_3,
+                       COLOR_GREY_4, COLOR_GREY_5, COLOR_GREY_6, COLOR_GREY_7 ])
+        self._dark = Color.palette([ COLOR_DARK_RED, COLOR_DARK_GREEN, COLOR_DARK_BLUE, COLOR_DARK_CYAN,
+                       COLOR_DARK_MAGENTA, COLOR_DARK_YELLOW, COLOR_PURPLE ])
         self._palettes = {
             'all':  self._all,
             'cool': self._cool,
@@ -62,11 +97,19 @@ class RingController(Controller):
             'grey': self._grey,
             'dark': self._dark
         }
+        # frame upload
+        self._symbols       = { c: i for i, c in enumerate(FRAME_SYMBOLS) }
+        self._user_palette  = bytearray(3 * len(FRAME_SYMBOLS)) # RGB, set via "frame color"
+        self._frame_palette = self._palette_rgb(self._all)      # RGB
+        self._frame_hold    = False
         self._ring = self._create_ring()
+        # layered animation, over the ring model
+        self._compositor = Compositor(self._scheduler, self._ring, self._ring_count,
+                fps=self._config.get('ring_fps', 30), base=self._render_model)
         self.reset_ring()
         self._last_update_ts  = self._get_time()
-        self._ring_timer_hz = 24
-        self._ring_timer = self._create_ring_timer()
+        self._rotate_job = self._scheduler.add('rotate', self._rotate_ring, period_ms=1000 // self._rotate_hz, start=False)
+        self._theme_job  = self._scheduler.add('theme', self._theme, period_ms=1000 // self._theme_hz, start=False)
         self._radiozoa_started   = False
         self._pixel.set_color(0, COLOR_BLACK)
 #       print('ring controller ready.')
@@ -76,81 +119,201 @@ class RingController(Controller):
         from pixel import Pixel
 
         _ring_pin   = self._config['ring_pin']
-        _ring = Pixel(pin=_ring_pin, pixel_count=self._ring_count, color_order=self._config['color_order'])
+        _ring = Pixel(pin=_ring_pin, pixel_count=self._ring_count, color_order=self._config['color_order'],
+                gamma=self._config.get('ring_gamma', 1.0))
         print('NeoPixel ring with {} pixels configured on pin {}'.format(self._ring_count, _ring_pin))
         _ring.set_color(0, COLOR_CYAN)
         time.sleep_ms(100)
         _ring.set_color(0, COLOR_BLACK)
         return _ring
 
-    def _create_ring_timer(self):
-        family = self._config['family']
-        if "STM32" in family:
-            from pyb import Timer
-
-            _ring_timer = Timer(1)
-            _ring_timer.init(freq=self._ring_timer_hz, callback=self._action)
-            return _ring_timer
-        else:
-            from machine import Timer
+    @property
+    def ring(self):
+        '''
+        The ring Pixel. Changes made with set() or fill() are written once per tick.
+        '''
+        return self._ring
 
-            _ring_timer = Timer(1)
-            _ring_timer.init(freq=self._ring_timer_hz, mode=Timer.PERIODIC, callback=self._action)
-            return _ring_timer
+    def show(self):
+        super().show()
+        if not self._frame_hold:
+            self._ring.show()
 
     # ring processing ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
     def reset_ring(self):
-        for pixel in self._ring_model:
-            pixel.reset()
+        _zero = bytes(3 * self._ring_count)
+        self._base[:]   = _zero
+        self._color[:]  = _zero
+        self._active[:] = bytes(len(self._active))
         self._update_ring()
 
+    def _is_active(self, index):
+        return self._active[index >> 3] & (1 << (index & 7))
+
+    def _set_model(self, index, rgb):
+        '''
+        Set the base and current color of the logical pixel, which is active
+        unless black.
+        '''
+        j = index * 3
+        self._base[j], self._base[j + 1], self._base[j + 2] = rgb
+        self._color[j], self._color[j + 1], self._color[j + 2] = rgb
+        if rgb[0] or rgb[1] or rgb[2]:
+            self._active[index >> 3] |= 1 << (index & 7)
+        else:
+            self._active[index >> 3] &= ~(1 << (index & 7))
+
     def _rotate_ring(self, shift=1):
-        if abs(shift) > 24:
+        '''
+        Rotate the ring by shift pixels in the current direction. The ring's
+        frame buffer is rotated directly; the model is unchanged, with the
+        offset recording where its pixel 0 now appears.
+        '''
+        if abs(shift) > self._ring_count:
             raise ValueError('shift value outside of bounds.')
         shift *= self._rotate_direction
-        self._ring_offset = (self._ring_offset + shift) % 24
-        self._update_ring()
+        self._ring_offset = (self._ring_offset + shift) % self._ring_count
+        if not self._compositor.running: # otherwise the next frame picks up the offset
+            self._ring.rotate(shift)
 
     def _update_ring(self):
-        for index in range(24):
-            rotated_index = (index - self._ring_offset) % 24
-            self._ring.set_color(index, self._ring_model[rotated_index].color)
+        '''
+        Copy the current colors of the model to the ring frame, as two runs:
+        the model's tail wraps to the start of the ring. While the compositor
+        is running it does this each frame instead.
+        '''
+        if self._compositor.running:
+            return
+        _split = 3 * (self._ring_count - self._ring_offset)
+        _color = memoryview(self._color)
+        self._ring.load(_color[_split:], 0)
+        self._ring.load(_color[:_split], self._ring_offset)
+
+    def _set_frame_pixel(self, index, rgb):
+        '''
+        Set the physical ring pixel from a frame upload, in both the model and
+        the ring's frame buffer.
+        '''
+        self._set_model((index - self._ring_offset) % self._ring_count, rgb)
+        self._ring.set_rgb(index, rgb[0], rgb[1], rgb[2])
+
+    def _palette_rgb(self, palette):
+        '''
+        Return an RGB table (three bytes per entry) for a palette of color
+        indices, padded with black to the 64 entries addressable by symbols.
+        '''
+        _table = Color.table()
+        _rgb = bytearray(3 * len(FRAME_SYMBOLS))
+        for i, index in enumerate(palette[:len(FRAME_SYMBOLS)]):
+            _rgb[3 * i:3 * i + 3] = _table[3 * index:3 * index + 3]
+        return _rgb
+
+    def _load_frame(self, encoding, offset, data):
+        '''
+        Decode frame data into the ring starting at the pixel offset, returning
+        the number of pixels set. The encodings are:
+
+            raw:  six hex digits (rrggbb) per pixel
+            pal:  one symbol per pixel, indexing the frame palette
+            rle:  pairs of symbols, a run length less one then a palette index
+
+        where symbols are the 64 characters of FRAME_SYMBOLS. The data is
+        validated before any pixel is set, raising a ValueError if invalid, so
+        that a bad upload leaves the ring unchanged.
+        '''
+        _count = self._ring_count
+        _index = offset
+        if encoding == 'raw':
+            _rgb = bytes.fromhex(data[:6 * min(len(data) // 6, _count - offset)])
+            for j in range(0, len(_rgb), 3):
+                self._set_frame_pixel(_index, (_rgb[j], _rgb[j + 1], _rgb[j + 2]))
+                _index += 1
+        else:
+            _symbols = self._symbols
+            _palette = self._frame_palette
+            for c in data:
+                if c not in _symbols:
+                    raise ValueError("invalid frame symbol: '{}'".format(c))
+            if encoding == 'pal':
+                for c in data:
+                    if _index >= _count:
+                        break
+                    j = 3 * _symbols[c]
+                    self._set_frame_pixel(_index, (_palette[j], _palette[j + 1], _palette[j + 2]))
+                    _index += 1
+            elif encoding == 'rle':
+                for i in range(0, len(data) - 1, 2):
+                    j = 3 * _symbols[data[i + 1]]
+                    _rgb = (_palette[j], _palette[j + 1], _palette[j + 2])
+                    for _ in range(_symbols[data[i]] + 1):
+                        if _index >= _count:
+                            break
+                        self._set_frame_pixel(_index, _rgb)
+                        _index += 1
+            else:
+                raise ValueError("unrecognised frame encoding: '{}'".format(encoding))
+        return _index - offset
+
+    def _render_model(self, frame):
+        '''
+        The compositor's base layer: copy the current colors of the model
+        into the frame, rotated by the offset.
+        '''
+        _split = 3 * (self._ring_count - self._ring_offset)
+        _color = memoryview(self._color)
+        _frame = memoryview(frame)
+        _frame[:len(frame) - _split] = _color[_split:]
+        _frame[len(frame) - _split:] = _color[:_split]
 
     def _set_ring_color(self, index, color):
 #       print('set ring color at {} to {}'.format(index, color))
-        actual_index = (index + self._ring_offset) % 24
-        self._ring_model[actual_index].base_color = color
-        self._ring_model[actual_index].color = color.rgb
-        self._ring.set_color(index, color.rgb)
+        actual_index = (index - self._ring_offset) % self._ring_count
+        self._set_model(actual_index, color.rgb)
+        self._ring.set(index, color.rgb)
 
-    def _restart_timer(self, freq=None):
+    def _set_ring_all(self, color):
+        _rgb = color.rgb
+        for index in range(self._ring_count):
+            self._set_model(index, _rgb)
+        self._ring.fill(_rgb)
+
+    def _create_effect(self, name):
         '''
-        Restart timer 1 if either rotate or theme is enabled.
+        Return the effect (or list of per-pixel effects) for a compositor
+        layer of the given name, None if unrecognised. The 'wave' effect is
+        the picofx RainbowWaveFX, if picofx is installed.
         '''
-        if freq:
-            self._ring_timer_hz = freq
-        self._ring_timer.deinit()
-        if self._enable_rotate or self._enable_theme:
-#           self._ring_timer.init(freq=self._ring_timer_hz)
-            self._ring_timer.init(freq=self._ring_timer_hz, callback=self._action)
-
-    def _action(self, t):
-        if self._enable_rotate:
-            self._rotate_pending = True
-        if self._enable_theme:
-            self._theme_pending = True
-
-    def tick(self, delta_ms):
-        # handle deferred ring updates first
-        if self._rotate_pending:
-            self._rotate_pending = False
-            self._rotate_ring()
-        if self._theme_pending:
-            self._theme_pending = False
-            self._theme()
-        # then handle pixel off and parent tick
-        super().tick(delta_ms)
+        _count = self._ring_count
+        if name == 'rainbow':
+            return RainbowWave(_count)
+        elif name == 'chase':
+            return Chase(_count)
+        elif name == 'sparkle':
+            return Sparkle(_count)
+        elif name == 'wave':
+            try:
+                from picofx.colour import RainbowWaveFX
+            except ImportError:
+                print('ERROR: picofx is not installed.')
+                return None
+            wave = RainbowWaveFX(speed=0.5, length=_count)
+            return [wave(i) for i in range(_count)]
+        return None
+
+    def _enable_rotation(self, enabled):
+        self._enable_rotate = enabled
+        if enabled:
+            self._scheduler.schedule(self._rotate_job)
+        else:
+            self._scheduler.cancel(self._rotate_job)
+
+    def _enable_theming(self, enabled):
+        self._enable_theme = enabled
+        if enabled:
+            self._scheduler.schedule(self._theme_job)
+        else:
+            self._scheduler.cancel(self._theme_job)
 
     # theme processing ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
@@ -159,18 +322,17 @@ class RingController(Controller):
         if palette is None:
             print("ERROR: no such palette: '{}'".format(palette_name))
             return
-        for pixel in self._ring_model:
-            pixel.reset()
-            pixel.phase = random.random()
+        self._ring_offset = 0
+        self.reset_ring()
+        for index in range(self._ring_count):
+            self._phases[index] = random.getrandbits(16)
         selected = []
-        available = list(range(24))
+        available = list(range(self._ring_count))
         for _ in range(count):
             idx = random.randrange(len(available))
             selected.append(available.pop(idx))
         for i in selected:
-            color = random.choice(palette)
-            self._ring_model[i]. base_color = color
-            self._ring_model[i].color = color.rgb
+            self._set_model(i, Color.at(random.choice(palette)).rgb)
         self._update_ring()
 
     def _init_theme(self, reset=False):
@@ -180,31 +342,30 @@ class RingController(Controller):
             self.reset_ring()
             existing_count = 0
         else:
-            existing_count = sum(1 for p in self._ring_model if p.is_active())
+            existing_count = sum(1 for i in range(self._ring_count) if self._is_active(i))
         new_pixels_needed = max(0, self._theme_target_pixels - existing_count)
-        available_colors = [c for c in Color.all_colors() if c != COLOR_BLACK]
         if new_pixels_needed > 0:
-            empty_positions = [i for i in range(24) if not self._ring_model[i].is_active()]
+            empty_positions = [i for i in range(self._ring_count) if not self._is_active(i)]
             for _ in range(new_pixels_needed):
                 if not empty_positions:
                     break
                 idx = random.randrange(len(empty_positions))
                 pos = empty_positions.pop(idx)
-                color = random.choice(available_colors)
-                self._ring_model[pos].base_color = color
-                self._ring_model[pos].color = color.rgb
-                self._ring_model[pos].phase = random.random()
+                self._set_model(pos, Color.at(random.choice(self._lit)).rgb)
+                self._phases[pos] = random.getrandbits(16)
         self._update_ring()
 
+    def _start_theme(self):
+        self._init_theme()
+        self._enable_theming(True)
+
     def _theme(self):
-        for index in range(24):
-            pixel = self._ring_model[index]
-            if not pixel.is_active():
-                continue
-            pixel.phase = (pixel.phase + 1.0 / self._pulse_steps) % 1.0
-            brightness = (math.sin(pixel.phase * 2 * math.pi) + 1) / 2
-            r, g, b = pixel.base_color.rgb
-            pixel.color = (int(r * brightness), int(g * brightness), int(b * brightness))
+        '''
+        Advance the pulse phase of each active pixel and scale its base color
+        by the tabulated brightness, then copy the frame to the ring.
+        '''
+        _pulse(self._color, self._base, self._phases, self._active,
+                self._ring_count, self._phase_step, _PULSE)
         self._update_ring()
 
     # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
@@ -212,13 +373,26 @@ class RingController(Controller):
     def print_help(self):
         super().print_help()
         print('''    ring clear |                            # set all ring pixels off
-       | all ( off | clear | <name> )       # set all ring pixels off or to color
+       | all ( off | clear | <name> )       # set all ring pixels off or to color (as a job)
     rotate on | off | fwd | cw | rev | ccw  # control ring pixel rotation
        | hz <n>                             # set rotation frequency
     theme on | off                          # enable/disable theme pulsation
        | hz <n>                             # set theme pulse frequency
        | pixels <count>                     # enable randomly-placed pixels in current palette
        | palette <name> <count>             # set palette with count of randomly-placed pixels
+
+    frame raw <offset> <rrggbb...>          # upload pixels from offset as hex RGB
+       | pal <offset> <symbols>             # upload pixels as frame palette indices
+       | rle <offset> <count,index pairs>   # upload pixels as run-length palette indices
+       | palette <name>                     # set frame palette (incl. 'user')
+       | color <index> <rrggbb>             # set user palette entry
+       | begin | show                       # hold ring updates / show the frame
+    anim on | off                           # enable/disable layered animation
+       | fps <n>                            # set animation frame rate
+       | add <effect> [<mode> [<opacity>]]  # add effect layer: rainbow, chase, sparkle, wave
+       | remove <effect> | clear            # remove one or all effect layers
+
+    theme on, pixels and palette run as jobs, returning "JOB <n>".
 ''')
 
     def pre_process(self, cmd, arg0, arg1, arg2, arg3, arg4):
@@ -245,12 +419,10 @@ class RingController(Controller):
                         if not color:
                             print("ERROR: could not find color: arg2: '{}'; arg3: '{}'".format(arg2, arg3))
                             return Controller._PACKED_ERR, COLOR_RED
-                        for idx in range(self._ring_count):
-                            self._set_ring_color(idx, color)
-                        return Controller._PACKED_ACK, COLOR_DARK_GREEN
+                        return self._accept(self._set_ring_all, (color,)), COLOR_DARK_GREEN
                 else:
                     index = int(arg1) - 1
-                    if 0 <= index <= 23:
+                    if 0 <= index < self._ring_count:
                         color = self._get_color(arg2, arg3)
                         if color:
                             self._set_ring_color(index, color)
@@ -267,15 +439,73 @@ class RingController(Controller):
                 self._enable_rotate = _rotating
             return Controller._PACKED_ERR, COLOR_RED
 
+        elif arg0 == "frame":
+            # e.g., "frame pal 0 0123456789abcdef" or "frame rle 0 n1n2" (see _load_frame)
+            if arg1 == 'raw' or arg1 == 'pal' or arg1 == 'rle':
+                offset = int(arg2)
+                if 0 <= offset < self._ring_count and arg3:
+                    self._load_frame(arg1, offset, arg3)
+                    return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'palette':
+                if arg2 == 'user':
+                    self._frame_palette = self._user_palette
+                    return Controller._PACKED_ACK, COLOR_DARK_GREEN
+                palette = self._palettes.get(arg2)
+                if palette:
+                    self._frame_palette = self._palette_rgb(palette)
+                    return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'color':
+                # set an entry of the user palette, e.g., "frame color 3 ff8000"
+                index = int(arg2)
+                if 0 <= index < len(FRAME_SYMBOLS) and arg3 and len(arg3) == 6:
+                    self._user_palette[3 * index:3 * index + 3] = bytes.fromhex(arg3)
+                    return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'begin':
+                # hold the ring until "frame show", so a multi-part frame appears at once
+                self._frame_hold = True
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'show':
+                self._frame_hold = False
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            print("ERROR: could not process input: '{}'".format(cmd))
+            return Controller._PACKED_ERR, COLOR_RED
+
+        elif arg0 == "anim":
+            if arg1 == 'on':
+                self._compositor.start()
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'off':
+                self._compositor.stop()
+                self._update_ring()
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'fps':
+                self._compositor.set_fps(int(arg2))
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'add':
+                # e.g., "anim add sparkle add 128"
+                effects = self._create_effect(arg2)
+                if effects is None or (arg3 and arg3 not in BLEND_MODES):
+                    print("ERROR: unrecognised effect or mode: '{}' '{}'".format(arg2, arg3))
+                    return Controller._PACKED_ERR, COLOR_RED
+                self._compositor.add_layer(arg2, effects, arg3 if arg3 else 'normal',
+                        int(arg4) if arg4 else 255)
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'remove':
+                if self._compositor.remove_layer(arg2):
+                    return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            elif arg1 == 'clear':
+                self._compositor.clear()
+                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+            print("ERROR: could not process input: '{}'".format(cmd))
+            return Controller._PACKED_ERR, COLOR_RED
+
         elif arg0 == "rotate":
             if arg1:
                 if arg1 == 'on':
-                    self._enable_rotate = True
-                    self._restart_timer()
+                    self._enable_rotation(True)
                     return Controller._PACKED_ACK, COLOR_DARK_GREEN
                 elif arg1 == 'off':
-                    self._enable_rotate = False
-                    self._restart_timer()
+                    self._enable_rotation(False)
                     return Controller._PACKED_ACK, COLOR_DARK_GREEN
                 elif arg1 == 'fwd' or arg1 == 'cw':
                     self._rotate_direction = 1
@@ -285,8 +515,9 @@ class RingController(Controller):
                     return Controller._PACKED_ACK, COLOR_DARK_GREEN
                 elif arg1 == 'hz':
                     hz = int(arg2)
-                    if hz > 0:
-                        self._restart_timer(hz)
+                    if 0 < hz <= 1000:
+                        self._rotate_hz = hz
+                        self._scheduler.set_period(self._rotate_job, 1000 // hz)
                         return Controller._PACKED_ACK, COLOR_DARK_GREEN
                     else:
                         return Controller._PACKED_ERR, COLOR_RED
@@ -302,58 +533,41 @@ class RingController(Controller):
 #               print("theme '{}' with arg0: '{}'; arg1: '{}'; arg2: '{}'; arg3: '{}'; arg4: '{}'".format(cmd, arg0, arg1, arg2, arg3, arg4))
                 if arg1:
                     if arg1 == 'on':
-                        self._init_theme()
-                        self._enable_theme = True
-                        return Controller._PACKED_ACK, COLOR_DARK_GREEN
+                        return self._accept(self._start_theme), COLOR_DARK_GREEN
                     elif arg1 == 'off':
-                        self._enable_theme = False
-                        self._restart_timer()
+                        self._enable_theming(False)
                         return Controller._PACKED_ACK, COLOR_DARK_GREEN
                     elif arg1 == 'hz':
                         hz = int(arg2)
-                        if hz > 0:
-                            self._restart_timer(hz)
+                        if 0 < hz <= 1000:
+                            self._theme_hz = hz
+                            self._scheduler.set_period(self._theme_job, 1000 // hz)
                             return Controller._PACKED_ACK, COLOR_DARK_GREEN
                         return Controller._PACKED_ERR, COLOR_RED
                     elif arg1 == 'pixels':
-                        _themed = self._enable_theme
-                        try:
-                            self._enable_theme = False
-                            target = int(arg2)
-                            if 1 <= target <= self._ring_count:
-                                self._theme_target_pixels = target
-                                self._init_theme(reset=True)
-                                return Controller._PACKED_ACK, COLOR_DARK_GREEN
-                            return Controller._PACKED_ERR, COLOR_RED
-                        finally:
-                            self._enable_theme = _themed
+                        target = int(arg2)
+                        if 1 <= target <= self._ring_count:
+                            self._theme_target_pixels = target
+                            return self._accept(self._init_theme, (True,)), COLOR_DARK_GREEN
+                        return Controller._PACKED_ERR, COLOR_RED
 
                     elif arg1 in self._palettes:
-                        _themed = self._enable_theme
-                        _rotating = self._enable_rotate
-                        self._enable_rotate = False
-                        self._enable_theme = False
-                        self._ring_offset = 0
                         try:
                             target = int(arg2)
-                            self._theme_target_pixels = target
                             if 1 <= target <= self._ring_count:
-                                self._populate(target, arg1)
-                                return Controller._PACKED_ACK, COLOR_DARK_GREEN
+                                self._theme_target_pixels = target
+                                return self._accept(self._populate, (target, arg1)), COLOR_DARK_GREEN
                             else:
                                 return Controller._PACKED_ERR, COLOR_RED
                         except Exception as e:
                             print('ERROR: {} raised with palette name: {}'.format(type(e), e))
                             return Controller._PACKED_ERR, COLOR_RED
-                        finally:
-                            self._enable_theme = _themed
-                            self._enable_rotate = _rotating
-                        return Controller._PACKED_ACK, COLOR_DARK_GREEN
 
                     elif arg1 == 'steps':
                         steps = int(arg2)
-                        if steps > 0:
+                        if 0 < steps <= 65536:
                             self._pulse_steps = steps
+                            self._phase_step  = 65536 // steps
                             return Controller._PACKED_ACK, COLOR_DARK_GREEN
                         return Controller._PACKED_ERR, COLOR_RED
                     else:
@@ -0,0 +1,176 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-19
+# modified: 2026-10-19
+#
+# A soft scheduler for periodic and one-shot jobs, driven from the main loop.
+
+import sys
+import time
+
+class Job:
+    '''
+    A scheduled job. A period of zero indicates a one-shot job, which may be
+    re-armed via Scheduler.schedule().
+
+    Args:
+        name:       the job name
+        callback:   a no-argument function called when the job is due
+        period_ms:  the job period in milliseconds, 0 for a one-shot job
+        priority:   higher priority jobs run first when several are due
+    '''
+    def __init__(self, name, callback, period_ms=0, priority=0):
+        self.name      = name
+        self.callback  = callback
+        self.period_ms = period_ms
+        self.priority  = priority
+        self.deadline  = 0
+        self.scheduled = False
+        self.key       = 't.' + name # profiler key
+
+    def __repr__(self):
+        return 'Job({}, period={}ms, priority={}{})'.format(
+                self.name, self.period_ms, self.priority, '' if self.scheduled else ', idle')
+
+class Scheduler:
+    '''
+    Holds jobs in deadline order and runs those that are due each time run()
+    is called. This replaces the various hardware timers and tick counters
+    previously used by the controllers: being called from the main loop, job
+    callbacks run in the same context as command processing and need no
+    deferred-execution flags.
+
+    Deadlines are compared using ticks_diff() and so are safe across ticks
+    wraparound, provided no job is scheduled more than half a ticks period
+    into the future.
+    '''
+    def __init__(self):
+        self._jobs     = [] # scheduled jobs, in deadline order
+        self._profiler = None
+
+    def set_profiler(self, profiler):
+        '''
+        Set the Profiler used to time each job callback, keyed as 't.<name>'.
+        '''
+        self._profiler = profiler
+
+    @property
+    def jobs(self):
+        return self._jobs
+
+    def add(self, name, callback, period_ms=0, delay_ms=None, priority=0, start=True):
+        '''
+        Create and return a new job. Unless start is False the job is scheduled
+        after delay_ms, which defaults to the period.
+        '''
+        job = Job(name, callback, period_ms, priority)
+        if start:
+            self.schedule(job, period_ms if delay_ms is None else delay_ms)
+        return job
+
+    def get(self, name):
+        '''
+        Return the scheduled job with the given name, None if not found.
+        '''
+        for job in self._jobs:
+            if job.name == name:
+                return job
+        return None
+
+    def schedule(self, job, delay_ms=None):
+        '''
+        Schedule or re-arm the job to run after delay_ms, by default its period.
+        '''
+        if job.scheduled:
+            self._jobs.remove(job)
+        job.deadline = time.ticks_add(time.ticks_ms(), job.period_ms if delay_ms is None else delay_ms)
+        self._insert(job)
+
+    def set_period(self, job, period_ms):
+        '''
+        Change the period of the job, re-arming it if currently scheduled.
+        '''
+        job.period_ms = period_ms
+        if job.scheduled:
+            self.schedule(job)
+
+    def cancel(self, job):
+        '''
+        Cancel the job (or the job of that name), returning True if it was scheduled.
+        '''
+        if isinstance(job, str):
+            job = self.get(job)
+        if job is not None and job.scheduled:
+            self._jobs.remove(job)
+            job.scheduled = False
+            return True
+        return False
+
+    def next_due_ms(self):
+        '''
+        Return the milliseconds until the next job is due, None if there are no jobs.
+        '''
+        if self._jobs:
+            return max(0, time.ticks_diff(self._jobs[0].deadline, time.ticks_ms()))
+        return None
+
+    def run(self):
+        '''
+        Run all jobs that are due, in deadline order except that the highest
+        priority job runs first when several are due. Periodic jobs are re-armed from
+        their previous deadline, so that they keep to their rate without drift;
+        if a job has fallen a full period behind it is re-armed from now.
+        '''
+        while self._jobs:
+            now = time.ticks_ms()
+            job = self._next_due(now)
+            if job is None:
+                return
+            self._jobs.remove(job)
+            job.scheduled = False
+            if job.period_ms > 0:
+                job.deadline = time.ticks_add(job.deadline, job.period_ms)
+                if time.ticks_diff(job.deadline, now) <= 0:
+                    job.deadline = time.ticks_add(now, job.period_ms)
+                self._insert(job)
+            try:
+                if self._profiler:
+                    _start_us = time.ticks_us()
+                    job.callback()
+                    self._profiler.record(job.key, time.ticks_diff(time.ticks_us(), _start_us))
+                else:
+                    job.callback()
+            except Exception as e:
+                print("ERROR: {} raised by job '{}': {}".format(type(e), job.name, e))
+                sys.print_exception(e)
+
+    def _next_due(self, now):
+        '''
+        Return the highest priority job that is due, None if none are due.
+        '''
+        selected = None
+        for job in self._jobs:
+            if time.ticks_diff(job.deadline, now) > 0:
+                break
+            if selected is None or job.priority > selected.priority:
+                selected = job
+        return selected
+
+    def _insert(self, job):
+        '''
+        Insert the job in deadline order, after any with the same deadline.
+        '''
+        jobs = self._jobs
+        i = len(jobs)
+        while i > 0 and time.ticks_diff(jobs[i - 1].deadline, job.deadline) > 0:
+            i -= 1
+        jobs.insert(i, job)
+        job.scheduled = True
+
+#EOF
@@ -6,7 +6,9 @@
 #
 # author:   Ichiro Furusato
 # created:  2026-02-09
-# modified: 2026-02-17
+# modified: 2026-10-19
+
+import time
 
 from controller import Controller
 from colors import *
@@ -18,7 +20,6 @@ class STM32Controller(Controller):
     '''
     def __init__(self, config):
         super().__init__(config)
-        self._pixel_off_pending = False
         # ready
 
     def _create_pixel(self):
@@ -32,28 +33,6 @@ class STM32Controller(Controller):
         _pixel.set_color(0, COLOR_BLACK)
         return _pixel
 
-    def _create_pixel_timer(self):
-        from pyb import Timer
-
-        self._pixel_timer = Timer(4)
-        self._pixel_timer.init(freq=self._pixel_timer_freq_hz, callback=self._timer_irq)
-
-    def _timer_irq(self, timer):
-        self._pixel_off_pending = True
-        self._pixel_timer.deinit()  # stop after first trigger
-
-    def _led_off(self, timer=None):
-        # override to use deferred execution via flag
-        self._pixel_off_pending = True
-
-    def tick(self, delta_ms):
-        # handle deferred pixel updates first
-        if self._pixel_off_pending:
-            self._pixel_off_pending = False
-            self._pixel.set_color(0, COLOR_BLACK)
-        # then do normal tick processing
-        super().tick(delta_ms)
-
     def pre_process(self, cmd, arg0, arg1, arg2, arg3, arg4):
         '''
         Pre-process the arguments, returning a response and color if a match occurs.